@@ -3,27 +3,52 @@ Restaurant Management System - Backend API
 A Flask-based REST API for managing restaurant operations including products, menus, orders, and customers.
 """
 
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, url_for, abort
 from flask_cors import CORS
-try:
-    import mariadb
-    from mariadb import Error
-    DB_DRIVER = 'mariadb'
-except ImportError:
-    import mysql.connector as mariadb
-    from mysql.connector import Error
-    DB_DRIVER = 'mysql'
 import json
 import os
+
+# Storage backend: 'mariadb' (a MariaDB/MySQL server) or 'sqlite' (an embedded file, no server)
+DB_BACKEND = os.environ.get('DB_BACKEND', 'mariadb')
+if DB_BACKEND == 'sqlite':
+    import sqlite_backend as mariadb
+    from sqlite_backend import Error
+    DB_DRIVER = 'sqlite'
+else:
+    try:
+        import mariadb
+        from mariadb import Error
+        DB_DRIVER = 'mariadb'
+    except ImportError:
+        import mysql.connector as mariadb
+        from mysql.connector import Error
+        DB_DRIVER = 'mysql'
 from werkzeug.utils import secure_filename
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
+import base64
+import click
+import csv
+import time
 import traceback
 from decimal import Decimal
+from db_pool import ConnectionPool
+from response_cache import CachedBody
+from migrations import apply_migrations, migration_status
+from json_provider import RowJSONProvider
+from order_events import EventBroker, EventRelay, SSE_HEADERS, SSE_KEEPALIVE, SSE_PREAMBLE, read_sse
+from image_pipeline import ImagePipeline
+from static_assets import StaticAssets
+from metrics import RequestMetrics
+from group_commit import GroupCommitWriter, WriterTimeout
+from customer_cache import CustomerCache
+from top_sellers import TopSellers
+from product_index import ProductIndex
+from product_io import IMPORT_FORMATS, EXPORT_FORMATS, detect_format, read_records, iter_csv
 
 # Flask App Configuration
 app = Flask(__name__)
-CORS(app, resources={r"/api/*": {"origins": "*"}})
+CORS(app, resources={r"/api/*": {"origins": "*"}}, expose_headers=['X-Next-Cursor', 'Link'])
 
 # File Upload Configuration
 UPLOAD_FOLDER = 'static/uploads'
@@ -31,41 +56,166 @@ ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max
 
+# Image Variant Configuration
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+IMAGE_DEFAULT_WIDTH = 640  # served when the request has no ?w=
+IMAGE_WORKERS = 2
+
+# Static Asset Configuration
+STATIC_EXTENSIONS = {'html', 'css', 'js', 'png', 'jpg', 'jpeg', 'gif', 'svg', 'ico', 'webp'}
+STATIC_DIRECTORIES = ('', 'js')  # project root (not recursive) and js/
+STATIC_MAX_AGE = 86400           # seconds; ?v=<etag> URLs are cached as immutable
+
+# Order Listing Configuration
+ORDER_STATUSES = ('pending', 'preparing', 'completed', 'cancelled')
+ORDERS_PAGE_SIZE = 50
+ORDERS_MAX_PAGE_SIZE = 200
+
+# Streaming Configuration
+# Clients opt into a streamed list response through the Accept header
+STREAM_FORMATS = {
+    'application/x-ndjson': 'ndjson',   # one JSON object per line
+    'application/stream+json': 'array'  # a JSON array written in chunks
+}
+STREAM_BATCH_SIZE = 500
+
+# Product Catalog Cache Configuration
+# Bounds staleness when several worker processes each hold their own cache
+CATALOG_CACHE_MAX_AGE = 30.0
+
+# Product Search Configuration
+PRODUCT_INDEX_MAX_AGE = 30.0  # seconds before the in-memory search index reloads from the database
+SEARCH_PAGE_SIZE = 50
+SEARCH_MAX_PAGE_SIZE = 200
+
+# Menu Configuration
+MENU_PRODUCTS_BATCH = 500  # product links per multi-row INSERT/DELETE
+
+# Product Import Configuration
+IMPORT_BATCH_SIZE = 500  # rows per executemany and per transaction
+IMPORT_MAX_ERRORS = 100  # row errors listed in an import summary (all are counted)
+
+# Order Event Stream Configuration
+ORDER_EVENTS_REPLAY_SIZE = 1000  # events kept for Last-Event-ID resume
+ORDER_EVENTS_KEEPALIVE = 15.0    # seconds between keep-alive comments
+ORDER_EVENTS_POLL_INTERVAL = 0.1  # seconds between checks for events written by other workers
+
+# Order Ingestion Configuration
+# With ORDER_GROUP_COMMIT=1, POST /api/orders hands validated orders to a writer thread
+# that commits up to ORDER_BATCH_SIZE of them per transaction, waiting at most
+# ORDER_BATCH_WAIT seconds for a batch to fill
+ORDER_GROUP_COMMIT = os.environ.get('ORDER_GROUP_COMMIT', '0') == '1'
+ORDER_BATCH_SIZE = 32
+ORDER_BATCH_WAIT = 0.005
+CUSTOMER_CACHE_SIZE = 10000  # emails and phones each kept for order-time customer lookups
+
+# Order Archiving Configuration
+# Finished orders older than ARCHIVE_AFTER_DAYS move to orders_archive/order_items_archive
+# (flask --app app orders archive); listings reach them only with ?include_archived=1
+ARCHIVE_AFTER_DAYS = 90
+ARCHIVE_STATUSES = ('completed', 'cancelled')
+ARCHIVE_BATCH_SIZE = 1000
+
+# Dashboard Configuration
+TOP_PRODUCTS_LIMIT = 5
+TOP_SELLERS_MAX_AGE = 60.0  # seconds before the in-memory top sellers reload from the database
+
+# Sales Report Configuration
+REPORT_GRANULARITIES = ('hour', 'day')
+REPORT_DEFAULT_DAYS = 7                # range used when from/to are not given
+REPORT_DEFAULT_STATUSES = ('pending', 'preparing', 'completed')  # cancelled orders are left out
+ROLLUP_BACKFILL_CHUNK = 5000           # orders read per pass by 'reports backfill'
+ROLLUP_WRITE_BATCH = 500               # rollup rows per multi-row upsert
+
 # Database Configuration
+# With DB_BACKEND=sqlite only 'database' is used: it names the file (restaurant_db.sqlite3)
 DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': '',
-    'database': 'restaurant_db',
-    'port': 3306
+    'host': os.environ.get('DB_HOST', 'localhost'),
+    'user': os.environ.get('DB_USER', 'root'),
+    'password': os.environ.get('DB_PASSWORD', ''),
+    'database': os.environ.get('DB_NAME', 'restaurant_db'),
+    'port': int(os.environ.get('DB_PORT', 3306))
 }
 
+# Connection Pool Configuration
+DB_POOL_CONFIG = {
+    'size': int(os.environ.get('DB_POOL_SIZE', 10)),  # max open connections per process
+    'timeout': 5.0,          # seconds to wait for a free connection
+    'validate_after': 30.0,  # ping connections idle longer than this
+    'max_lifetime': 1800.0   # recycle connections older than this
+}
+
+# Metrics Configuration
+SLOW_REQUEST_THRESHOLD = 0.5  # seconds; slower requests are logged with their SQL
+
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+image_pipeline = ImagePipeline(UPLOAD_FOLDER, '/static/uploads', widths=IMAGE_VARIANT_WIDTHS,
+                               workers=IMAGE_WORKERS)
+
 # Utility Functions
 def allowed_file(filename):
     """Check if file extension is allowed."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def save_uploaded_image():
+    """Store request.files['image'] through the image pipeline; return its URL, or None if no valid image was sent."""
+    image = request.files.get('image')
+    if image is None or image.filename == '' or not allowed_file(image.filename):
+        return None
+    return image_pipeline.save(image)
+
+def _connect():
+    """Open a new driver connection using DB_CONFIG."""
+    if DB_DRIVER == 'mysql':
+        # MySQL connector uses different parameter names
+        config = DB_CONFIG.copy()
+        return mariadb.connect(**config)
+    return mariadb.connect(**DB_CONFIG)
+
+db_pool = ConnectionPool(_connect, **DB_POOL_CONFIG)
+request_metrics = RequestMetrics(slow_threshold=SLOW_REQUEST_THRESHOLD)
+
+class InstrumentedJSONProvider(RowJSONProvider):
+    """RowJSONProvider that reports encoding time to the request metrics."""
+
+    def dumps(self, obj, **kwargs):
+        with request_metrics.serializing():
+            return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        with request_metrics.serializing():
+            return super().response(*args, **kwargs)
+
+app.json = InstrumentedJSONProvider(app)  # encodes Decimal/datetime rows directly
+
+@app.before_request
+def start_request_metrics():
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    request_metrics.begin(request.method, route)
+
+@app.after_request
+def finish_request_metrics(response):
+    if response.mimetype == 'text/event-stream':
+        # Event streams stay open indefinitely; record them once the stream starts
+        request_metrics.finish(response.status_code)
+    else:
+        # Streamed bodies are still being generated here, so finish once they are closed
+        response.call_on_close(lambda status=response.status_code: request_metrics.finish(status))
+    return response
+
 @contextmanager
 def get_db_connection():
-    """Database connection context manager."""
-    connection = None
+    """Database connection context manager backed by the connection pool."""
     try:
-        if DB_DRIVER == 'mysql':
-            # MySQL connector uses different parameter names
-            config = DB_CONFIG.copy()
-            connection = mariadb.connect(**config)
-        else:
-            connection = mariadb.connect(**DB_CONFIG)
-        yield connection
+        started = time.perf_counter()
+        with db_pool.connection() as connection:
+            request_metrics.record_connection_wait(time.perf_counter() - started)
+            yield request_metrics.instrument(connection)
     except Error as e:
         print(f"Database connection error: {e}")
         raise
-    finally:
-        if connection:
-            connection.close()
 
 def safe_float(value, default=0.0):
     """Safely convert value to float."""
@@ -81,19 +231,455 @@ def safe_int(value, default=0):
     except (ValueError, TypeError):
         return default
 
-def serialize_decimal(obj):
-    """Convert Decimal objects to float for JSON serialization."""
-    if isinstance(obj, Decimal):
-        return float(obj)
-    elif isinstance(obj, datetime):
-        return obj.isoformat()
-    return obj
+def group_by_key(rows, key, keep_key=False):
+    """Group row dictionaries into lists by the given key column."""
+    groups = {}
+    for row in rows:
+        value = row[key] if keep_key else row.pop(key)
+        groups.setdefault(value, []).append(row)
+    return groups
+
+def in_placeholders(values):
+    """Return a '%s, %s, ...' placeholder list for an SQL IN clause."""
+    return ', '.join(['%s'] * len(values))
+
+def parse_datetime_arg(value, end_of_range=False):
+    """Parse an ISO date/datetime query argument; a bare date used as an upper bound covers that whole day."""
+    parsed = datetime.fromisoformat(value)
+    if end_of_range and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+def encode_order_cursor(order):
+    """Encode an order's (order_date, id) position as an opaque pagination cursor."""
+    order_date = order['order_date']
+    if isinstance(order_date, datetime):
+        order_date = order_date.isoformat()
+    raw = f"{order_date}|{order['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_order_cursor(cursor_value):
+    """Decode a pagination cursor into (order_date, id); raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor_value.encode()).decode()
+        order_date, order_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(order_date), int(order_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+def parse_status_arg(value):
+    """Split a comma-separated status argument; raises ValueError naming any unknown status."""
+    statuses = [s.strip() for s in value.split(',') if s.strip()]
+    invalid = [s for s in statuses if s not in ORDER_STATUSES]
+    if invalid:
+        raise ValueError(f"Invalid status: {', '.join(invalid)}")
+    return statuses
+
+def build_order_filters(args):
+    """Translate order listing query arguments into SQL conditions and parameters.
+
+    Raises ValueError with a client-facing message on invalid input.
+    """
+    conditions = []
+    params = []
+
+    statuses = parse_status_arg(args.get('status', ''))
+    if statuses:
+        conditions.append(f"o.status IN ({in_placeholders(statuses)})")
+        params.extend(statuses)
+
+    try:
+        if args.get('from'):
+            conditions.append("o.order_date >= %s")
+            params.append(parse_datetime_arg(args['from']))
+        if args.get('to'):
+            conditions.append("o.order_date < %s")
+            params.append(parse_datetime_arg(args['to'], end_of_range=True))
+    except ValueError:
+        raise ValueError('from/to must be ISO dates or datetimes') from None
+
+    search = args.get('q', '').strip()
+    if search:
+        conditions.append("(CAST(o.id AS CHAR) LIKE %s OR c.name LIKE %s)")
+        params.extend([f"%{search}%"] * 2)
+
+    if args.get('cursor'):
+        condition, condition_params = order_keyset_condition(*decode_order_cursor(args['cursor']))
+        conditions.append(condition)
+        params.extend(condition_params)
+
+    return conditions, params
+
+def order_keyset_condition(order_date, order_id):
+    """SQL condition and parameters for orders listed after (order_date, id), newest first."""
+    return "(o.order_date < %s OR (o.order_date = %s AND o.id < %s))", [order_date, order_date, order_id]
+
+# Columns shared by the hot order tables and their archive copies
+ARCHIVED_COLUMNS = {
+    'orders': 'id, customer_id, total_amount, status, order_date',
+    'order_items': 'id, order_id, product_id, quantity, price'
+}
+
+def include_archived_arg():
+    """Whether the request asked for archived orders too (?include_archived=1)."""
+    return request.args.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+def order_table(table, include_archived=False):
+    """Table expression for orders or order_items, optionally unioned with its archive table."""
+    if not include_archived:
+        return table
+    columns = ARCHIVED_COLUMNS[table]
+    return f"(SELECT {columns} FROM {table} UNION ALL SELECT {columns} FROM {table}_archive)"
+
+def order_list_sql(conditions, include_archived=False):
+    """Build the order listing query for the given filter conditions."""
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    return f"""
+        SELECT o.*, c.name as customer_name, c.email as customer_email, c.phone as customer_phone
+        FROM {order_table('orders', include_archived)} o
+        LEFT JOIN customers c ON o.customer_id = c.id
+        {where}
+        ORDER BY o.order_date DESC, o.id DESC
+    """
+
+def attach_order_items(cursor, orders, include_archived=False):
+    """Load the items of all given orders with one IN query and attach them as 'items' lists."""
+    items_by_order = {}
+    if orders:
+        order_ids = [order['id'] for order in orders]
+        cursor.execute(f"""
+            SELECT oi.*, p.name as product_name, p.image_url as product_image
+            FROM {order_table('order_items', include_archived)} oi
+            JOIN products p ON oi.product_id = p.id
+            WHERE oi.order_id IN ({in_placeholders(order_ids)})
+        """, order_ids)
+        items_by_order = group_by_key(cursor.fetchall(), 'order_id', keep_key=True)
+    for order in orders:
+        order['items'] = items_by_order.get(order['id'], [])
+    return orders
+
+# Streaming Responses
+def requested_stream_format():
+    """Return the streaming format requested by the Accept header, or None for a buffered response."""
+    best = request.accept_mimetypes.best_match(['application/json', *STREAM_FORMATS])
+    return STREAM_FORMATS.get(best)
+
+def iter_query_batches(sql, params=(), batch_size=STREAM_BATCH_SIZE):
+    """Yield lists of row dictionaries read from an unbuffered server-side cursor."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+        cursor.close()
+
+def iter_order_batches(conditions, params=(), include_archived=False, limit=None,
+                       batch_size=STREAM_BATCH_SIZE):
+    """Yield batches of orders with their items attached, newest first.
+
+    Orders are read in keyset chunks on (order_date, id) and each chunk's items
+    are loaded on the same connection before the next chunk, so an export
+    holds one pooled connection and never waits for a second. limit caps the
+    total number of orders.
+    """
+    position = None
+    with get_db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        while limit is None or limit > 0:
+            chunk_conditions, chunk_params = list(conditions), list(params)
+            if position is not None:
+                condition, condition_params = order_keyset_condition(*position)
+                chunk_conditions.append(condition)
+                chunk_params.extend(condition_params)
+            size = batch_size if limit is None else min(batch_size, limit)
+            cursor.execute(order_list_sql(chunk_conditions, include_archived) + " LIMIT %s", (*chunk_params, size))
+            orders = cursor.fetchall()
+            if not orders:
+                break
+            attach_order_items(cursor, orders, include_archived)
+            yield orders
+            if len(orders) < size:
+                break
+            if limit is not None:
+                limit -= len(orders)
+            position = (orders[-1]['order_date'], orders[-1]['id'])
+
+def stream_response(batches, stream_format):
+    """Stream row batches as NDJSON or as a chunked JSON array, encoding row by row."""
+    def generate():
+        first = True
+        if stream_format == 'array':
+            yield '['
+        for rows in batches:
+            encoded = [app.json.dumps(row) for row in rows]
+            if stream_format == 'ndjson':
+                yield '\n'.join(encoded) + '\n'
+            else:
+                yield ('' if first else ',') + ','.join(encoded)
+            first = False
+        if stream_format == 'array':
+            yield ']'
+
+    mimetype = 'application/x-ndjson' if stream_format == 'ndjson' else 'application/json'
+    response = Response(generate(), mimetype=mimetype)
+    response.headers['X-Accel-Buffering'] = 'no'  # don't let a proxy buffer the stream
+    return response
+
+# Dashboard Statistics
+# Counters kept in dashboard_counters/product_sales and updated by the write
+# routes inside their own transactions, so the dashboard never scans history.
+DASHBOARD_COUNTERS = ('total_products', 'total_orders', 'total_customers', 'total_revenue', 'pending_orders')
+
+def to_cents(value):
+    """Normalize a count or money amount to a two-decimal Decimal for comparisons."""
+    return Decimal(str(value or 0)).quantize(Decimal('0.01'))
+
+def bump_dashboard_counters(cursor, **deltas):
+    """Apply counter deltas (e.g. total_orders=1) in the caller's transaction."""
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    cases = ' '.join(['WHEN %s THEN %s'] * len(deltas))
+    cursor.execute(
+        f"UPDATE dashboard_counters SET value = value + CASE name {cases} END "
+        f"WHERE name IN ({in_placeholders(deltas)})",
+        [value for item in deltas.items() for value in item] + list(deltas)
+    )
+
+def record_product_sales(cursor, lines, sign=1):
+    """Add (product_id, units, revenue) order lines to the per-product sales totals.
+
+    Cancelled orders don't count: sign=-1 takes a cancelled order's lines back out.
+    """
+    totals = {}
+    for product_id, units, line_revenue in lines:
+        sold, revenue = totals.get(product_id, (0, Decimal(0)))
+        totals[product_id] = (sold + sign * int(units), revenue + sign * to_cents(line_revenue))
+    if not totals:
+        return
+    cursor.execute(
+        "INSERT INTO product_sales (product_id, total_sold, revenue) VALUES "
+        + ', '.join(['(%s, %s, %s)'] * len(totals))
+        + " ON DUPLICATE KEY UPDATE total_sold = total_sold + VALUES(total_sold), "
+          "revenue = revenue + VALUES(revenue)",
+        [value for product_id, (sold, revenue) in totals.items() for value in (product_id, sold, revenue)]
+    )
+
+def product_sales_sql(limit=None):
+    """SQL totalling units sold and revenue per product over non-cancelled orders, archive included.
+
+    With limit, ranks the top sellers.
+    """
+    sql = f"""
+        SELECT oi.product_id, SUM(oi.quantity), COALESCE(SUM(oi.quantity * oi.price), 0)
+        FROM {order_table('order_items', True)} oi
+        JOIN {order_table('orders', True)} o ON o.id = oi.order_id
+        WHERE o.status <> 'cancelled'
+        GROUP BY oi.product_id
+    """
+    if limit is not None:
+        sql += f" HAVING SUM(oi.quantity) > 0 ORDER BY 2 DESC, 3 DESC, oi.product_id LIMIT {int(limit)}"
+    return sql
+
+def compute_dashboard_stats(cursor):
+    """Recompute the counters and per-product sales from the base and archive tables (full scans).
+
+    Per-product sales leave out cancelled orders.
+    """
+    queries = {
+        'total_products': "SELECT COUNT(*) FROM products",
+        'total_orders': "SELECT (SELECT COUNT(*) FROM orders) + (SELECT COUNT(*) FROM orders_archive)",
+        'total_customers': "SELECT COUNT(*) FROM customers",
+        'total_revenue': f"""
+            SELECT COALESCE(SUM(total_amount), 0) FROM {order_table('orders', True)} o
+            WHERE status = 'completed'
+        """,
+        'pending_orders': "SELECT COUNT(*) FROM orders WHERE status = 'pending'",
+    }
+    counters = {}
+    for name, sql in queries.items():
+        cursor.execute(sql)
+        counters[name] = to_cents(cursor.fetchone()[0])
+
+    cursor.execute(product_sales_sql())
+    sales = {row[0]: (int(row[1]), to_cents(row[2])) for row in cursor.fetchall()}
+    return counters, sales
+
+def rebuild_dashboard_stats(cursor):
+    """Replace the stored counters and per-product sales with freshly computed values."""
+    counters, sales = compute_dashboard_stats(cursor)
+    cursor.execute("DELETE FROM dashboard_counters")
+    cursor.executemany(
+        "INSERT INTO dashboard_counters (name, value) VALUES (%s, %s)",
+        list(counters.items())
+    )
+    cursor.execute("DELETE FROM product_sales")
+    if sales:
+        cursor.executemany(
+            "INSERT INTO product_sales (product_id, total_sold, revenue) VALUES (%s, %s, %s)",
+            [(product_id, sold, revenue) for product_id, (sold, revenue) in sales.items()]
+        )
+
+def check_dashboard_stats(cursor):
+    """Compare stored counters with freshly computed ones; return a list of mismatch descriptions."""
+    counters, sales = compute_dashboard_stats(cursor)
+    cursor.execute("SELECT name, value FROM dashboard_counters")
+    stored = {row[0]: to_cents(row[1]) for row in cursor.fetchall()}
+    cursor.execute("SELECT product_id, total_sold, revenue FROM product_sales WHERE total_sold <> 0")
+    stored_sales = {row[0]: (int(row[1]), to_cents(row[2])) for row in cursor.fetchall()}
+
+    mismatches = []
+    for name, expected in counters.items():
+        if stored.get(name) != expected:
+            mismatches.append(f"{name}: stored {stored.get(name)}, actual {expected}")
+    for product_id in sorted(set(sales) | set(stored_sales)):
+        if stored_sales.get(product_id) != sales.get(product_id):
+            mismatches.append(
+                f"product {product_id} sales: stored {stored_sales.get(product_id)}, actual {sales.get(product_id)}"
+            )
+    return mismatches
+
+# Top Sellers
+# Units sold and revenue per product over orders that aren't cancelled, held in
+# memory (top_sellers.py) and updated by the order routes after they commit.
+# Reloads read the all-time totals from product_sales, not from order history.
+top_sellers = TopSellers(max_age=TOP_SELLERS_MAX_AGE)
+
+def load_top_sellers(cursor):
+    """(Re)load the top sellers tracker: all-time totals plus recent lines for the sliding windows."""
+    now = datetime.now()
+    cursor.execute("SELECT product_id, total_sold, revenue FROM product_sales")
+    totals = cursor.fetchall()
+    cursor.execute("""
+        SELECT o.order_date, oi.product_id, oi.quantity, oi.quantity * oi.price
+        FROM orders o
+        JOIN order_items oi ON oi.order_id = o.id
+        WHERE o.status <> 'cancelled' AND o.order_date >= %s
+    """, (now - top_sellers.retention,))
+    top_sellers.load(totals, cursor.fetchall(), now)
+
+# Order Archiving
+# Finished orders are moved, not deleted: the dashboard counters keep counting
+# them and ?include_archived=1 listings read both tables.
+def archivable_orders_sql(limit=False):
+    """Select the ids of finished orders placed before a cutoff, oldest first."""
+    sql = (f"SELECT id FROM orders WHERE status IN ({in_placeholders(ARCHIVE_STATUSES)}) "
+           "AND order_date < %s ORDER BY id")
+    return sql + " LIMIT %s FOR UPDATE" if limit else sql
+
+def archive_orders(conn, older_than_days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE):
+    """Move finished orders older than older_than_days, with their items, into the archive tables.
+
+    Commits after every batch so locks are held briefly; returns the number of orders moved.
+    """
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    cursor = conn.cursor()
+    moved = 0
+    while True:
+        cursor.execute(archivable_orders_sql(limit=True), (*ARCHIVE_STATUSES, cutoff, batch_size))
+        order_ids = [row[0] for row in cursor.fetchall()]
+        if not order_ids:
+            conn.rollback()
+            return moved
+
+        placeholders = in_placeholders(order_ids)
+        for table, key in (('orders', 'id'), ('order_items', 'order_id')):
+            columns = ARCHIVED_COLUMNS[table]
+            cursor.execute(
+                f"INSERT INTO {table}_archive ({columns}) SELECT {columns} FROM {table} WHERE {key} IN ({placeholders})",
+                order_ids
+            )
+        cursor.execute(f"DELETE FROM order_items WHERE order_id IN ({placeholders})", order_ids)
+        cursor.execute(f"DELETE FROM orders WHERE id IN ({placeholders})", order_ids)
+        conn.commit()
+        moved += len(order_ids)
+
+# Sales Rollups
+# Hourly order count, units and revenue per status (sales_hourly) and per
+# product and status (product_sales_hourly). The order routes keep them up to
+# date in their own transactions, so sales reports never scan orders.
+SALES_ROLLUPS = {
+    'sales_hourly': ('hour_start', 'status'),
+    'product_sales_hourly': ('hour_start', 'product_id', 'status')
+}
+
+def rollup_order(totals, order_date, status, total_amount, lines, sign=1):
+    """Accumulate one order into rollup deltas; sign=-1 takes it back out.
+
+    totals maps each rollup table to {key: [order_count, units, revenue]};
+    lines are (product_id, quantity, line_revenue).
+    """
+    hour = order_date.replace(minute=0, second=0, microsecond=0)
+    deltas = [('sales_hourly', (hour, status), sum(quantity for _, quantity, _ in lines), total_amount)]
+    products = {}
+    for product_id, quantity, revenue in lines:
+        units, product_revenue = products.get(product_id, (0, 0))
+        products[product_id] = (units + quantity, to_cents(product_revenue) + to_cents(revenue))
+    deltas += [('product_sales_hourly', (hour, product_id, status), units, revenue)
+               for product_id, (units, revenue) in products.items()]
+
+    for table, key, units, revenue in deltas:
+        row = totals.setdefault(table, {}).setdefault(key, [0, 0, Decimal(0)])
+        row[0] += sign
+        row[1] += sign * int(units)
+        row[2] += sign * to_cents(revenue)
+    return totals
+
+def write_sales_rollups(cursor, totals):
+    """Add accumulated rollup deltas to the rollup tables with multi-row upserts."""
+    for table, rows in totals.items():
+        columns = (*SALES_ROLLUPS[table], 'order_count', 'units', 'revenue')
+        rows = [(*key, *values) for key, values in rows.items()]
+        row_sql = f"({', '.join(['%s'] * len(columns))})"
+        for start in range(0, len(rows), ROLLUP_WRITE_BATCH):
+            batch = rows[start:start + ROLLUP_WRITE_BATCH]
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ', '.join([row_sql] * len(batch))
+                + " ON DUPLICATE KEY UPDATE order_count = order_count + VALUES(order_count), "
+                  "units = units + VALUES(units), revenue = revenue + VALUES(revenue)",
+                [value for row in batch for value in row]
+            )
 
-def serialize_row(row):
-    """Serialize a database row dictionary."""
-    if isinstance(row, dict):
-        return {k: serialize_decimal(v) for k, v in row.items()}
-    return row
+def rebuild_sales_rollups(cursor, chunk_size=ROLLUP_BACKFILL_CHUNK):
+    """Recompute the rollup tables from orders and the archive; returns the number of orders read.
+
+    Orders are read chunk_size at a time by id with their items aggregated per
+    product in the same pass, and the totals are written back with batched
+    upserts. The caller commits, so readers never see a half-built rollup.
+    """
+    totals = {}
+    order_count = 0
+    for orders_table, items_table in (('orders', 'order_items'), ('orders_archive', 'order_items_archive')):
+        last_id = 0
+        while True:
+            cursor.execute(
+                f"SELECT id, status, total_amount, order_date FROM {orders_table} "
+                "WHERE id > %s ORDER BY id LIMIT %s",
+                (last_id, chunk_size)
+            )
+            orders = cursor.fetchall()
+            if not orders:
+                break
+            first_id, last_id = orders[0][0], orders[-1][0]
+            cursor.execute(
+                f"SELECT order_id, product_id, SUM(quantity), SUM(quantity * price) FROM {items_table} "
+                "WHERE order_id BETWEEN %s AND %s GROUP BY order_id, product_id",
+                (first_id, last_id)
+            )
+            lines = {}
+            for order_id, product_id, quantity, revenue in cursor.fetchall():
+                lines.setdefault(order_id, []).append((product_id, quantity, revenue))
+            for order_id, status, total_amount, order_date in orders:
+                rollup_order(totals, order_date, status, total_amount, lines.get(order_id, []))
+            order_count += len(orders)
+
+    for table in SALES_ROLLUPS:
+        cursor.execute(f"DELETE FROM {table}")
+    write_sales_rollups(cursor, totals)
+    return order_count
 
 # Database Initialization
 def initialize_database():
@@ -107,11 +693,13 @@ def initialize_database():
         cursor = conn.cursor()
 
         # Create database if not exists
-        cursor.execute("CREATE DATABASE IF NOT EXISTS restaurant_db")
-        cursor.execute("USE restaurant_db")
+        database = DB_CONFIG['database']
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`")
+        cursor.execute(f"USE `{database}`")
 
-        # Create tables
+        # Create tables and bring the schema up to date
         create_tables(cursor)
+        apply_migrations(conn)
 
         # Check if we need to insert sample data
         cursor.execute("SELECT COUNT(*) FROM products")
@@ -123,6 +711,18 @@ def initialize_database():
         else:
             print(f"✓ Database already contains {product_count} products")
 
+        # Seed the dashboard counters on first run
+        cursor.execute("SELECT COUNT(*) FROM dashboard_counters")
+        if cursor.fetchone()[0] == 0:
+            print("📊 Building dashboard counters...")
+            rebuild_dashboard_stats(cursor)
+
+        # Backfill the sales rollups on first run
+        cursor.execute("SELECT COUNT(*) FROM sales_hourly")
+        if cursor.fetchone()[0] == 0:
+            print("📈 Building sales rollups...")
+            rebuild_sales_rollups(cursor)
+
         conn.commit()
         cursor.close()
         conn.close()
@@ -255,15 +855,233 @@ def insert_sample_data(cursor):
 # API Routes
 
 # Products Routes
+def build_product_catalog():
+    """Serialize the full product list for the catalog cache."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM products ORDER BY created_at DESC")
+        products = cursor.fetchall()
+    return app.json.dumps(products).encode('utf-8')
+
+product_catalog = CachedBody(build_product_catalog, max_age=CATALOG_CACHE_MAX_AGE)
+
+# Search and category lookups are answered from memory (product_index.py);
+# the write routes below update the index after they commit.
+product_index = ProductIndex(max_age=PRODUCT_INDEX_MAX_AGE)
+
+def ensure_product_index():
+    """Load the product index on first use and once it is older than PRODUCT_INDEX_MAX_AGE."""
+    if not product_index.needs_load():
+        return
+    version = product_index.version
+    with get_db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM products")
+        product_index.load(cursor.fetchall(), version)
+
+def index_product(cursor, product_id):
+    """Refresh one product in the search index from its committed row."""
+    cursor.execute("SELECT * FROM products WHERE id = %s", (product_id,))
+    row = cursor.fetchone()
+    if row:
+        product_index.upsert(row)
+    else:
+        product_index.remove(product_id)
+
+def validate_product(name, category, description, price, image_url=''):
+    """Return cleaned (name, category, description, price, image_url); raise ValueError if invalid."""
+    def text(value):
+        return '' if value is None else str(value).strip()
+
+    name, category, description, image_url = text(name), text(category), text(description), text(image_url)
+    price = safe_float(price)
+    if not name:
+        raise ValueError('Product name is required')
+    if price <= 0:
+        raise ValueError('Price must be greater than 0')
+    for field, value, limit in (('name', name, 255), ('category', category, 100), ('image_url', image_url, 255)):
+        if len(value) > limit:
+            raise ValueError(f"Product {field} is longer than {limit} characters")
+    return name, category, description, price, image_url
+
+def parse_price_arg(value):
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Invalid price: {value}")
+
 @app.route('/api/products', methods=['GET'])
 def get_products():
-    """Get all products."""
+    """Get all products from the catalog cache (304 on a matching If-None-Match).
+
+    Streams from the database instead when the Accept header asks for NDJSON
+    or a streamed array.
+    """
+    try:
+        stream_format = requested_stream_format()
+        if stream_format:
+            return stream_response(
+                iter_query_batches("SELECT * FROM products ORDER BY created_at DESC"), stream_format
+            )
+
+        body, etag = product_catalog.get()
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'  # always revalidate with If-None-Match
+        return response.make_conditional(request)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/products/search', methods=['GET'])
+def search_products():
+    """Search products from the in-memory index.
+
+    Query parameters: q (every word must prefix a word of the name or
+    description), category, min_price/max_price and limit.
+    """
     try:
+        limit = min(max(safe_int(request.args.get('limit'), SEARCH_PAGE_SIZE), 1), SEARCH_MAX_PAGE_SIZE)
+        try:
+            min_price = parse_price_arg(request.args.get('min_price'))
+            max_price = parse_price_arg(request.args.get('max_price'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        ensure_product_index()
+        total, products = product_index.search(
+            request.args.get('q', ''), request.args.get('category'), min_price, max_price, limit
+        )
+        return jsonify({'total': total, 'products': products})
+    except Exception as e:
+        print(f"Error in search_products: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/categories', methods=['GET'])
+def get_categories():
+    """List product categories by name; ?counts=1 returns {name, product_count} objects."""
+    try:
+        ensure_product_index()
+        categories = sorted(product_index.categories().items(), key=lambda item: item[0].lower())
+        if request.args.get('counts', '').lower() in ('1', 'true', 'yes'):
+            return jsonify([{'name': name, 'product_count': count} for name, count in categories])
+        return jsonify([name for name, _ in categories])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Bulk Product Import/Export
+def import_products(conn, records, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """Validate (row_number, record) pairs and insert them in batches, one transaction per batch.
+
+    Returns a summary with the imported and failed row counts and up to
+    IMPORT_MAX_ERRORS {row, error} entries. With dry_run nothing is written
+    and imported counts the rows that would be.
+    """
+    summary = {'imported': 0, 'failed': 0, 'errors': [], 'dry_run': dry_run}
+    cursor = conn.cursor()
+    batch = []
+    insert_sql = """
+        INSERT INTO products (name, category, description, price, image_url)
+        VALUES (%s, %s, %s, %s, %s)
+    """
+
+    def fail(number, error):
+        summary['failed'] += 1
+        if len(summary['errors']) < IMPORT_MAX_ERRORS:
+            summary['errors'].append({'row': number, 'error': error})
+
+    def flush():
+        if not batch or dry_run:
+            summary['imported'] += len(batch)
+            batch.clear()
+            return
+        try:
+            cursor.executemany(insert_sql, [values for _, values in batch])
+            inserted = len(batch)
+        except Error:
+            # Retry the batch row by row to find the rows the database rejects
+            conn.rollback()
+            inserted = 0
+            for number, values in batch:
+                try:
+                    cursor.execute(insert_sql, values)
+                    inserted += 1
+                except Error as e:
+                    fail(number, str(e))
+        bump_dashboard_counters(cursor, total_products=inserted)
+        conn.commit()
+        summary['imported'] += inserted
+        product_catalog.invalidate()
+        product_index.invalidate()
+        batch.clear()
+
+    number = 0
+    try:
+        for number, record in records:
+            if isinstance(record, ValueError):
+                fail(number, str(record))
+                continue
+            try:
+                values = validate_product(record.get('name'), record.get('category'), record.get('description'),
+                                          record.get('price'), record.get('image_url'))
+            except ValueError as e:
+                fail(number, str(e))
+                continue
+            batch.append((number, values))
+            if len(batch) >= batch_size:
+                flush()
+    except (ValueError, csv.Error) as e:
+        fail(number + 1, f"Unreadable input, import stopped: {e}")
+    flush()
+    return summary
+
+@app.route('/api/products/import', methods=['POST'])
+def bulk_import_products():
+    """Import products from a CSV, NDJSON or JSON array upload.
+
+    Send the file as the multipart field 'file' or as the raw request body.
+    The format comes from ?format=, else the file extension or Content-Type.
+    Rows are validated like POST /api/products and committed in batches of
+    IMPORT_BATCH_SIZE; ?dry_run=1 only validates.
+    """
+    try:
+        upload = request.files.get('file')
+        if upload:
+            stream, fmt = upload.stream, detect_format(upload.filename, upload.mimetype)
+        else:
+            stream, fmt = request.stream, detect_format(mimetype=request.mimetype)
+        fmt = (request.args.get('format') or fmt or '').lower()
+        if fmt not in IMPORT_FORMATS:
+            return jsonify({'error': f"Unsupported import format; use format={', '.join(IMPORT_FORMATS)}"}), 400
+
+        dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
         with get_db_connection() as conn:
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("SELECT * FROM products ORDER BY created_at DESC")
-            products = [serialize_row(row) for row in cursor.fetchall()]
-            return jsonify(products)
+            summary = import_products(conn, read_records(stream, fmt), dry_run=dry_run)
+        return jsonify(summary)
+
+    except Exception as e:
+        print(f"Error in bulk_import_products: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/products/export', methods=['GET'])
+def export_products():
+    """Stream every product as NDJSON (default) or CSV (?format=csv)."""
+    try:
+        fmt = request.args.get('format', 'ndjson').lower()
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({'error': f"Unsupported export format; use format={', '.join(EXPORT_FORMATS)}"}), 400
+
+        batches = iter_query_batches("SELECT * FROM products ORDER BY id")
+        if fmt == 'csv':
+            response = Response(iter_csv(batches), mimetype='text/csv')
+            response.headers['X-Accel-Buffering'] = 'no'
+        else:
+            response = stream_response(batches, 'ndjson')
+        response.headers['Content-Disposition'] = f'attachment; filename=products.{fmt}'
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -272,29 +1090,16 @@ def create_product():
     """Create a new product with optional image upload."""
     try:
         # Handle image upload if provided
-        image_url = ''
-        if 'image' in request.files:
-            image = request.files['image']
-            if image.filename != '' and allowed_file(image.filename):
-                filename = secure_filename(image.filename)
-                # Add timestamp to avoid filename conflicts
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-                filename = timestamp + filename
-                image_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                image.save(image_path)
-                image_url = f'/static/uploads/{filename}'
-
-        # Get product data
-        name = request.form.get('name', '').strip()
-        category = request.form.get('category', '').strip()
-        description = request.form.get('description', '').strip()
-        price = safe_float(request.form.get('price', 0))
+        image_url = save_uploaded_image() or ''
 
-        # Validation
-        if not name:
-            return jsonify({'error': 'Product name is required'}), 400
-        if price <= 0:
-            return jsonify({'error': 'Price must be greater than 0'}), 400
+        # Get and validate product data
+        try:
+            name, category, description, price, image_url = validate_product(
+                request.form.get('name'), request.form.get('category'),
+                request.form.get('description'), request.form.get('price', 0), image_url
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         with get_db_connection() as conn:
             cursor = conn.cursor()
@@ -304,7 +1109,10 @@ def create_product():
             """, (name, category, description, price, image_url))
 
             product_id = cursor.lastrowid
+            bump_dashboard_counters(cursor, total_products=1)
             conn.commit()
+            product_catalog.invalidate()
+            index_product(conn.cursor(dictionary=True), product_id)
 
             return jsonify({
                 'message': 'Product created successfully',
@@ -329,14 +1137,7 @@ def update_product(product_id):
     """Update an existing product."""
     try:
         # Handle image upload if provided
-        image_url = None
-        if 'image' in request.files:
-            image = request.files['image']
-            if image.filename != '' and allowed_file(image.filename):
-                filename = secure_filename(image.filename)
-                image_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                image.save(image_path)
-                image_url = f'/static/uploads/{filename}'
+        image_url = save_uploaded_image()
 
         # Get form data or JSON data
         if request.content_type and 'multipart/form-data' in request.content_type:
@@ -366,6 +1167,8 @@ def update_product(product_id):
                   data['description'], image_url, product_id))
 
             conn.commit()
+            product_catalog.invalidate()
+            index_product(conn.cursor(dictionary=True), product_id)
             return jsonify({'message': 'Product updated successfully'})
 
     except Exception as e:
@@ -373,22 +1176,97 @@ def update_product(product_id):
 
 @app.route('/api/products/<int:product_id>', methods=['DELETE'])
 def delete_product(product_id):
-    """Delete a product and its references."""
+    """Delete a product that has never been ordered, and its menu links.
+
+    Ordered products are kept: their order items, hot or archived, are order
+    history that the dashboard counters, sales rollups and top sellers count.
+    """
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
 
-            # Remove references in related tables
+            # Lock the product so no order can reference it between the check and the delete
+            cursor.execute("SELECT id FROM products WHERE id = %s FOR UPDATE", (product_id,))
+            if cursor.fetchone() is None:
+                conn.rollback()
+                return jsonify({'error': 'Product not found'}), 404
+            for items_table in ('order_items', 'order_items_archive'):
+                cursor.execute(f"SELECT 1 FROM {items_table} WHERE product_id = %s LIMIT 1", (product_id,))
+                if cursor.fetchone() is not None:
+                    conn.rollback()
+                    return jsonify({'error': 'Product has been ordered and is kept for the order history; '
+                                             'remove it from its menus instead'}), 409
+
             cursor.execute("DELETE FROM menu_products WHERE product_id = %s", (product_id,))
-            cursor.execute("DELETE FROM order_items WHERE product_id = %s", (product_id,))
             cursor.execute("DELETE FROM products WHERE id = %s", (product_id,))
+            bump_dashboard_counters(cursor, total_products=-cursor.rowcount)
 
             conn.commit()
+            product_catalog.invalidate()
+            product_index.remove(product_id)
             return jsonify({'message': 'Product deleted successfully'})
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Menu Products
+# Menus change by set difference: only added and removed links are written,
+# in multi-row statements of up to MENU_PRODUCTS_BATCH ids.
+def parse_product_ids(values):
+    """Return the distinct positive product ids from a list (invalid entries are skipped)."""
+    return sorted({product_id for product_id in map(safe_int, values or []) if product_id > 0})
+
+def menu_product_ids(cursor, menu_id):
+    cursor.execute("SELECT product_id FROM menu_products WHERE menu_id = %s", (menu_id,))
+    return {row[0] for row in cursor.fetchall()}
+
+def missing_products(cursor, product_ids):
+    """Return the ids in product_ids that have no products row."""
+    found = set()
+    for start in range(0, len(product_ids), MENU_PRODUCTS_BATCH):
+        chunk = product_ids[start:start + MENU_PRODUCTS_BATCH]
+        cursor.execute(f"SELECT id FROM products WHERE id IN ({in_placeholders(chunk)})", chunk)
+        found.update(row[0] for row in cursor.fetchall())
+    return [product_id for product_id in product_ids if product_id not in found]
+
+def add_menu_products(cursor, menu_id, product_ids):
+    """Link products to a menu; ids already linked are ignored."""
+    product_ids = sorted(product_ids)
+    for start in range(0, len(product_ids), MENU_PRODUCTS_BATCH):
+        chunk = product_ids[start:start + MENU_PRODUCTS_BATCH]
+        cursor.execute(
+            "INSERT IGNORE INTO menu_products (menu_id, product_id) VALUES " + ', '.join(['(%s, %s)'] * len(chunk)),
+            [value for product_id in chunk for value in (menu_id, product_id)]
+        )
+
+def remove_menu_products(cursor, menu_id, product_ids):
+    """Unlink products from a menu; return the number of links removed."""
+    product_ids = sorted(product_ids)
+    removed = 0
+    for start in range(0, len(product_ids), MENU_PRODUCTS_BATCH):
+        chunk = product_ids[start:start + MENU_PRODUCTS_BATCH]
+        cursor.execute(
+            f"DELETE FROM menu_products WHERE menu_id = %s AND product_id IN ({in_placeholders(chunk)})",
+            [menu_id, *chunk]
+        )
+        removed += cursor.rowcount
+    return removed
+
+def menu_exists(cursor, menu_id):
+    cursor.execute("SELECT id FROM menus WHERE id = %s", (menu_id,))
+    return cursor.fetchone() is not None
+
+def requested_product_ids():
+    """Product ids from a JSON body ({"product_ids": [...]} or {"product_id": n}) or ?product_id=1,2."""
+    data = request.get_json(silent=True) or {}
+    if 'product_ids' in data:
+        values = data['product_ids'] if isinstance(data['product_ids'], list) else [data['product_ids']]
+    elif 'product_id' in data:
+        values = [data['product_id']]
+    else:
+        values = (request.args.get('product_id') or '').split(',')
+    return parse_product_ids(values)
+
 # Menus Routes
 @app.route('/api/menus', methods=['GET'])
 def get_menus():
@@ -399,19 +1277,17 @@ def get_menus():
             cursor.execute("SELECT * FROM menus ORDER BY created_at DESC")
             menus = cursor.fetchall()
 
-            # Get products for each menu
+            # Fetch every menu/product link in one query instead of one per menu
+            cursor.execute("""
+                SELECT mp.menu_id, p.* FROM menu_products mp
+                JOIN products p ON p.id = mp.product_id
+                ORDER BY p.name
+            """)
+            products_by_menu = group_by_key(cursor.fetchall(), 'menu_id')
+
             for menu in menus:
-                cursor.execute("""
-                    SELECT p.* FROM products p
-                    JOIN menu_products mp ON p.id = mp.product_id
-                    WHERE mp.menu_id = %s
-                    ORDER BY p.name
-                """, (menu['id'],))
-                menu['products'] = [serialize_row(p) for p in cursor.fetchall()]
-
-            # Serialize menus
-            serialized_menus = [serialize_row(menu) for menu in menus]
-            return jsonify(serialized_menus)
+                menu['products'] = products_by_menu.get(menu['id'], [])
+            return jsonify(menus)
 
     except Exception as e:
         print(f"Error in get_menus: {e}")
@@ -431,14 +1307,7 @@ def create_menu():
             product_ids_str = request.form.get('product_ids', '[]')
 
             # Handle image upload
-            image_url = None
-            if 'image' in request.files:
-                image = request.files['image']
-                if image.filename != '' and allowed_file(image.filename):
-                    filename = secure_filename(image.filename)
-                    image_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                    image.save(image_path)
-                    image_url = f'/static/uploads/{filename}'
+            image_url = save_uploaded_image()
         else:
             data = request.get_json()
             name = data.get('name', '').strip()
@@ -458,13 +1327,14 @@ def create_menu():
                 product_ids = json.loads(product_ids_str)
             else:
                 product_ids = product_ids_str or []
-
-            if not isinstance(product_ids, list) or len(product_ids) == 0:
-                return jsonify({'error': 'At least one product must be selected'}), 400
-
         except json.JSONDecodeError:
             return jsonify({'error': 'Invalid product_ids format'}), 400
 
+        # Invalid entries are dropped before checking that a product is left
+        product_ids = parse_product_ids(product_ids) if isinstance(product_ids, list) else []
+        if not product_ids:
+            return jsonify({'error': 'At least one product must be selected'}), 400
+
         with get_db_connection() as conn:
             cursor = conn.cursor()
 
@@ -477,13 +1347,11 @@ def create_menu():
             menu_id = cursor.lastrowid
 
             # Add products to menu
-            for product_id in product_ids:
-                product_id_int = safe_int(product_id)
-                if product_id_int > 0:
-                    cursor.execute("""
-                        INSERT INTO menu_products (menu_id, product_id)
-                        VALUES (%s, %s)
-                    """, (menu_id, product_id_int))
+            unknown = missing_products(cursor, product_ids)
+            if unknown:
+                conn.rollback()
+                return jsonify({'error': f"Unknown product id(s): {', '.join(map(str, unknown))}"}), 400
+            add_menu_products(cursor, menu_id, product_ids)
 
             conn.commit()
             return jsonify({
@@ -507,14 +1375,7 @@ def update_menu(menu_id):
             product_ids_str = request.form.get('product_ids', '[]')
 
             # Handle image upload
-            image_url = None
-            if 'image' in request.files:
-                image = request.files['image']
-                if image.filename != '' and allowed_file(image.filename):
-                    filename = secure_filename(image.filename)
-                    image_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                    image.save(image_path)
-                    image_url = f'/static/uploads/{filename}'
+            image_url = save_uploaded_image()
         else:
             data = request.get_json()
             name = data.get('name', '').strip()
@@ -553,18 +1414,69 @@ def update_menu(menu_id):
                 WHERE id=%s
             """, (name, description, is_visible, category, image_url, menu_id))
 
-            # Update menu products
-            cursor.execute("DELETE FROM menu_products WHERE menu_id = %s", (menu_id,))
-            for product_id in product_ids:
-                product_id_int = safe_int(product_id)
-                if product_id_int > 0:
-                    cursor.execute("""
-                        INSERT INTO menu_products (menu_id, product_id)
-                        VALUES (%s, %s)
-                    """, (menu_id, product_id_int))
+            # Update menu products: write only the difference from the current links
+            # (the UPDATE above holds the menu row lock, so concurrent edits don't interleave)
+            wanted = set(parse_product_ids(product_ids))
+            current = menu_product_ids(cursor, menu_id)
+            added, removed = sorted(wanted - current), sorted(current - wanted)
+            unknown = missing_products(cursor, added)
+            if unknown:
+                conn.rollback()
+                return jsonify({'error': f"Unknown product id(s): {', '.join(map(str, unknown))}"}), 400
+            add_menu_products(cursor, menu_id, added)
+            remove_menu_products(cursor, menu_id, removed)
 
             conn.commit()
-            return jsonify({'message': 'Menu updated successfully'})
+            return jsonify({'message': 'Menu updated successfully', 'added': added, 'removed': removed})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/menus/<int:menu_id>/products', methods=['POST'])
+def add_products_to_menu(menu_id):
+    """Add products to a menu without resending its whole product list.
+
+    Body: {"product_ids": [...]} or {"product_id": n}. Products already on
+    the menu are left alone.
+    """
+    try:
+        product_ids = requested_product_ids()
+        if not product_ids:
+            return jsonify({'error': 'At least one product id is required'}), 400
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            if not menu_exists(cursor, menu_id):
+                return jsonify({'error': 'Menu not found'}), 404
+            unknown = missing_products(cursor, product_ids)
+            if unknown:
+                return jsonify({'error': f"Unknown product id(s): {', '.join(map(str, unknown))}"}), 400
+
+            added = sorted(set(product_ids) - menu_product_ids(cursor, menu_id))
+            add_menu_products(cursor, menu_id, added)
+            conn.commit()
+            return jsonify({'message': 'Menu products added', 'added': added})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/menus/<int:menu_id>/products', methods=['DELETE'])
+@app.route('/api/menus/<int:menu_id>/products/<int:product_id>', methods=['DELETE'])
+def remove_products_from_menu(menu_id, product_id=None):
+    """Remove products from a menu: one by URL, or several by body or ?product_id=1,2."""
+    try:
+        product_ids = [product_id] if product_id is not None else requested_product_ids()
+        if not product_ids:
+            return jsonify({'error': 'At least one product id is required'}), 400
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            if not menu_exists(cursor, menu_id):
+                return jsonify({'error': 'Menu not found'}), 404
+            removed = sorted(set(product_ids) & menu_product_ids(cursor, menu_id))
+            remove_menu_products(cursor, menu_id, removed)
+            conn.commit()
+            return jsonify({'message': 'Menu products removed', 'removed': removed})
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -582,39 +1494,186 @@ def delete_menu(menu_id):
         return jsonify({'error': str(e)}), 500
 
 # Orders Routes
+# Order changes are appended to the order_events table in the writing
+# transaction. Each process relays new rows into its own broker, which feeds
+# its /api/orders/stream clients, so every worker streams every order.
+order_events = EventBroker(ORDER_EVENTS_REPLAY_SIZE, encode=app.json.dumps)
+
+def record_order_event(cursor, event_type, data):
+    """Append an event to the order_events log in the caller's transaction; return its id.
+
+    Ids come from the one-row order_event_sequence, which stays locked until
+    the commit, so they have no gaps and commit in order: a relay that has read
+    an id has seen every event before it.
+    """
+    cursor.execute("UPDATE order_event_sequence SET last_event_id = last_event_id + 1 WHERE id = 1")
+    cursor.execute("SELECT last_event_id FROM order_event_sequence WHERE id = 1")
+    event_id = int(cursor.fetchone()[0])
+    cursor.execute(
+        "INSERT INTO order_events (id, event_type, data) VALUES (%s, %s, %s)",
+        (event_id, event_type, app.json.dumps(data))
+    )
+    return event_id
+
+def read_order_events(after_id=None):
+    """Return (id, type, data_json) log rows after after_id, or the newest ones when it is None."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        if after_id is None:
+            cursor.execute(
+                "SELECT id, event_type, data FROM order_events ORDER BY id DESC LIMIT %s",
+                (ORDER_EVENTS_REPLAY_SIZE,)
+            )
+            return cursor.fetchall()[::-1]
+        cursor.execute(
+            "SELECT id, event_type, data FROM order_events WHERE id > %s ORDER BY id LIMIT %s",
+            (after_id, ORDER_EVENTS_REPLAY_SIZE)
+        )
+        return cursor.fetchall()
+
+def trim_order_events(through_id):
+    """Delete log rows up to through_id (the relay keeps the newest ORDER_EVENTS_REPLAY_SIZE)."""
+    with get_db_connection() as conn:
+        conn.cursor().execute("DELETE FROM order_events WHERE id <= %s", (through_id,))
+        conn.commit()
+
+order_relay = EventRelay(order_events, read_order_events, trim_order_events,
+                         poll_interval=ORDER_EVENTS_POLL_INTERVAL, keep=ORDER_EVENTS_REPLAY_SIZE)
+
 @app.route('/api/orders', methods=['GET'])
 def get_orders():
-    """Get all orders with customer and item details."""
+    """Get a page of orders (newest first) with customer and item details.
+
+    Query parameters: limit, cursor (from the X-Next-Cursor header of the
+    previous page), status (comma-separated), from/to on order_date, q (part
+    of the order id or customer name) and include_archived=1 to also list
+    orders moved to the archive tables.
+    """
     try:
+        # Parse paging and filter arguments
+        limit = min(max(safe_int(request.args.get('limit'), ORDERS_PAGE_SIZE), 1), ORDERS_MAX_PAGE_SIZE)
+        include_archived = include_archived_arg()
+        try:
+            conditions, params = build_order_filters(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # Streamed exports cover the whole filtered history unless a limit is given
+        stream_format = requested_stream_format()
+        if stream_format:
+            batches = iter_order_batches(conditions, params, include_archived,
+                                         limit=limit if 'limit' in request.args else None)
+            return stream_response(batches, stream_format)
+
         with get_db_connection() as conn:
             cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT o.*, c.name as customer_name, c.email as customer_email, c.phone as customer_phone
-                FROM orders o
-                LEFT JOIN customers c ON o.customer_id = c.id
-                ORDER BY o.order_date DESC
-            """)
+            cursor.execute(order_list_sql(conditions, include_archived) + " LIMIT %s", (*params, limit + 1))
             orders = cursor.fetchall()
 
-            # Get order items for each order
-            for order in orders:
-                cursor.execute("""
-                    SELECT oi.*, p.name as product_name, p.image_url as product_image
-                    FROM order_items oi
-                    JOIN products p ON oi.product_id = p.id
-                    WHERE oi.order_id = %s
-                """, (order['id'],))
-                order['items'] = [serialize_row(item) for item in cursor.fetchall()]
+            has_more = len(orders) > limit
+            orders = orders[:limit]
 
-            # Serialize orders
-            serialized_orders = [serialize_row(order) for order in orders]
-            return jsonify(serialized_orders)
+            # Load the items for the whole page in one query
+            attach_order_items(cursor, orders, include_archived)
+
+            response = jsonify(orders)
+            if has_more:
+                next_cursor = encode_order_cursor(orders[-1])
+                next_args = request.args.to_dict()
+                next_args['cursor'] = next_cursor
+                response.headers['X-Next-Cursor'] = next_cursor
+                response.headers['Link'] = f'<{url_for("get_orders", **next_args)}>; rel="next"'
+            return response
 
     except Exception as e:
         print(f"Error in get_orders: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+customer_cache = CustomerCache(CUSTOMER_CACHE_SIZE)
+
+def insert_order(cursor, order):
+    """Write one validated order (customer, order row, items, counters) without committing.
+
+    The result's 'customer' is the (id, email, phone) row to add to customer_cache once
+    the transaction has committed, or None when the customer came from the cache.
+    """
+    # Create or get customer, skipping the lookup for customers we have seen before
+    customer_row = None
+    customer_id = customer_cache.lookup(order['customer_email'], order['customer_phone'])
+    if customer_id is None:
+        cursor.execute(
+            "SELECT id, email, phone FROM customers WHERE email = %s OR phone = %s",
+            (order['customer_email'], order['customer_phone'])
+        )
+        customer = cursor.fetchone()
+
+        if customer:
+            customer_row = tuple(customer)
+        else:
+            cursor.execute(
+                "INSERT INTO customers (name, email, phone) VALUES (%s, %s, %s)",
+                (order['customer_name'], order['customer_email'], order['customer_phone'])
+            )
+            customer_row = (cursor.lastrowid, order['customer_email'], order['customer_phone'])
+            bump_dashboard_counters(cursor, total_customers=1)
+        customer_id = customer_row[0]
+
+    # Resolve every product price with one lookup and reuse it below
+    lines = order['lines']
+    product_ids = sorted({product_id for product_id, _ in lines})
+    cursor.execute(
+        f"SELECT id, price FROM products WHERE id IN ({in_placeholders(product_ids)})",
+        product_ids
+    )
+    prices = {row[0]: float(row[1]) for row in cursor.fetchall()}
+    priced_lines = [(product_id, quantity, prices[product_id])
+                    for product_id, quantity in lines if product_id in prices]
+
+    # Calculate total amount
+    total_amount = sum(price * quantity for _, quantity, price in priced_lines)
+
+    # Create order (order_date is set here so the sales rollup knows its hour)
+    order_date = datetime.now().replace(microsecond=0)
+    cursor.execute(
+        "INSERT INTO orders (customer_id, total_amount, status, order_date) VALUES (%s, %s, %s, %s)",
+        (customer_id, total_amount, 'pending', order_date)
+    )
+    order_id = cursor.lastrowid
+
+    # Add order items with a single multi-row insert
+    if priced_lines:
+        cursor.execute(
+            "INSERT INTO order_items (order_id, product_id, quantity, price) VALUES "
+            + ', '.join(['(%s, %s, %s, %s)'] * len(priced_lines)),
+            [value for line in priced_lines for value in (order_id, *line)]
+        )
+
+    sale_lines = [(product_id, quantity, quantity * price) for product_id, quantity, price in priced_lines]
+    bump_dashboard_counters(cursor, total_orders=1, pending_orders=1)
+    record_product_sales(cursor, sale_lines)
+    write_sales_rollups(cursor, rollup_order({}, order_date, 'pending', total_amount, sale_lines))
+    record_order_event(cursor, 'order_created', {
+        'order_id': order_id,
+        'customer_id': customer_id,
+        'customer_name': order['customer_name'],
+        'total_amount': total_amount,
+        'status': 'pending',
+        'items': [{'product_id': product_id, 'quantity': quantity, 'price': price}
+                  for product_id, quantity, price in priced_lines]
+    })
+    return {
+        'order_id': order_id,
+        'customer_id': customer_id,
+        'customer': customer_row,
+        'order_date': order_date,
+        'total_amount': total_amount,
+        'priced_lines': priced_lines
+    }
+
+order_writer = GroupCommitWriter(get_db_connection, insert_order, max_batch=ORDER_BATCH_SIZE,
+                                 max_wait=ORDER_BATCH_WAIT)
+
 @app.route('/api/orders', methods=['POST'])
 def create_order():
     """Create a new order with items."""
@@ -635,65 +1694,33 @@ def create_order():
         if not items or len(items) == 0:
             return jsonify({'error': 'Order must contain at least one item'}), 400
 
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-
-            # Create or get customer
-            cursor.execute(
-                "SELECT id FROM customers WHERE email = %s OR phone = %s",
-                (customer_email, customer_phone)
-            )
-            customer = cursor.fetchone()
-
-            if customer:
-                customer_id = customer[0]
-            else:
-                cursor.execute(
-                    "INSERT INTO customers (name, email, phone) VALUES (%s, %s, %s)",
-                    (customer_name, customer_email, customer_phone)
-                )
-                customer_id = cursor.lastrowid
-
-            # Calculate total amount
-            total_amount = 0
-            for item in items:
-                product_id = safe_int(item.get('product_id'))
-                quantity = safe_int(item.get('quantity', 1))
-
-                cursor.execute("SELECT price FROM products WHERE id = %s", (product_id,))
-                product = cursor.fetchone()
-                if product:
-                    price = float(product[0])
-                    total_amount += price * quantity
-
-            # Create order
-            cursor.execute(
-                "INSERT INTO orders (customer_id, total_amount, status) VALUES (%s, %s, %s)",
-                (customer_id, total_amount, 'pending')
-            )
-            order_id = cursor.lastrowid
-
-            # Add order items
-            for item in items:
-                product_id = safe_int(item.get('product_id'))
-                quantity = safe_int(item.get('quantity', 1))
-
-                cursor.execute("SELECT price FROM products WHERE id = %s", (product_id,))
-                product = cursor.fetchone()
-                if product:
-                    price = float(product[0])
-                    cursor.execute(
-                        "INSERT INTO order_items (order_id, product_id, quantity, price) VALUES (%s, %s, %s, %s)",
-                        (order_id, product_id, quantity, price)
-                    )
+        order = {
+            'customer_name': customer_name,
+            'customer_email': customer_email,
+            'customer_phone': customer_phone,
+            'lines': [(safe_int(item.get('product_id')), safe_int(item.get('quantity', 1))) for item in items]
+        }
+        if ORDER_GROUP_COMMIT:
+            result = order_writer.submit(order)
+        else:
+            with get_db_connection() as conn:
+                result = insert_order(conn.cursor(), order)
+                conn.commit()
+        if result['customer'] is not None:
+            customer_cache.remember(*result['customer'])
+        top_sellers.record(result['order_date'], [(product_id, quantity, quantity * price)
+                                                  for product_id, quantity, price in result['priced_lines']])
+        order_relay.notify()
 
-            conn.commit()
+        return jsonify({
+            'message': 'Order created successfully',
+            'order_id': result['order_id'],
+            'total_amount': result['total_amount']
+        }), 201
 
-            return jsonify({
-                'message': 'Order created successfully',
-                'order_id': order_id,
-                'total_amount': total_amount
-            }), 201
+    except WriterTimeout as e:
+        # The order was withdrawn before it was written, so the client can safely retry
+        return jsonify({'error': f"Order queue is busy, please retry ({e})"}), 503
 
     except Exception as e:
         print(f"Error in create_order: {e}")
@@ -707,14 +1734,59 @@ def update_order_status(order_id):
         data = request.get_json()
         if not data or 'status' not in data:
             return jsonify({'error': 'Status is required'}), 400
+        status = data['status']
+        if status not in ORDER_STATUSES:
+            return jsonify({'error': f"Invalid status: {status}"}), 400
 
         with get_db_connection() as conn:
             cursor = conn.cursor()
+
+            # Lock the row so concurrent updates adjust the counters from the right status
+            cursor.execute(
+                "SELECT status, total_amount, order_date FROM orders WHERE id = %s FOR UPDATE",
+                (order_id,)
+            )
+            order = cursor.fetchone()
+            if not order:
+                return jsonify({'error': 'Order not found'}), 404
+            old_status, total_amount, order_date = order
+
             cursor.execute(
                 "UPDATE orders SET status = %s WHERE id = %s",
-                (data['status'], order_id)
+                (status, order_id)
+            )
+            bump_dashboard_counters(
+                cursor,
+                pending_orders=(status == 'pending') - (old_status == 'pending'),
+                total_revenue=((status == 'completed') - (old_status == 'completed')) * total_amount
             )
+
+            # Move the order between status rows of its hour in the sales rollups
+            if status != old_status:
+                cursor.execute(
+                    "SELECT product_id, SUM(quantity), SUM(quantity * price) FROM order_items "
+                    "WHERE order_id = %s GROUP BY product_id",
+                    (order_id,)
+                )
+                lines = cursor.fetchall()
+                totals = rollup_order({}, order_date, old_status, total_amount, lines, sign=-1)
+                write_sales_rollups(cursor, rollup_order(totals, order_date, status, total_amount, lines))
+
+            # Cancelling an order (or reviving one) takes it out of (or back into) the sales totals
+            cancelled = (status == 'cancelled') != (old_status == 'cancelled')
+            sign = -1 if status == 'cancelled' else 1
+            if cancelled:
+                record_product_sales(cursor, lines, sign=sign)
+            record_order_event(cursor, 'order_status_changed', {
+                'order_id': order_id,
+                'status': status,
+                'previous_status': old_status
+            })
             conn.commit()
+
+            if cancelled:
+                top_sellers.record(order_date, lines, sign=sign)
+            order_relay.notify()
             return jsonify({'message': 'Order status updated successfully'})
 
     except Exception as e:
@@ -722,23 +1794,59 @@ def update_order_status(order_id):
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+def order_stream_position(req):
+    """Event id an order stream resumes after: the Last-Event-ID header or ?last_event_id=."""
+    last_id = req.headers.get('Last-Event-ID') or req.args.get('last_event_id')
+    return safe_int(last_id, None) if last_id else None
+
+@app.route('/api/orders/stream', methods=['GET'])
+def stream_order_events():
+    """Server-Sent Events stream of order_created and order_status_changed events.
+
+    Resumes after the Last-Event-ID header (or ?last_event_id=) from a bounded
+    replay buffer; sends a 'reset' event when that id can no longer be resumed,
+    telling the client to reload orders. Idle streams never touch the database.
+    """
+    last_id = order_stream_position(request)
+    order_relay.catch_up(last_id)
+
+    def generate():
+        position = last_id
+        order_events.subscribe()
+        try:
+            yield SSE_PREAMBLE
+            while not order_events.closed:
+                text, position = read_sse(order_events, position, timeout=ORDER_EVENTS_KEEPALIVE)
+                if text or not order_events.closed:
+                    yield text or SSE_KEEPALIVE
+        finally:
+            order_events.unsubscribe()
+
+    return Response(generate(), headers=SSE_HEADERS)
+
 # Customers Routes
 @app.route('/api/customers', methods=['GET'])
 def get_customers():
-    """Get all customers with order count."""
+    """Get all customers with order count; streams when the Accept header asks for it.
+
+    order_count covers recent orders only unless include_archived=1 is given.
+    """
+    customers_sql = f"""
+        SELECT c.*, COUNT(o.id) as order_count
+        FROM customers c
+        LEFT JOIN {order_table('orders', include_archived_arg())} o ON c.id = o.customer_id
+        GROUP BY c.id
+        ORDER BY c.created_at DESC
+    """
     try:
+        stream_format = requested_stream_format()
+        if stream_format:
+            return stream_response(iter_query_batches(customers_sql), stream_format)
+
         with get_db_connection() as conn:
             cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT c.*, COUNT(o.id) as order_count
-                FROM customers c
-                LEFT JOIN orders o ON c.id = o.customer_id
-                GROUP BY c.id
-                ORDER BY c.created_at DESC
-            """)
-            customers = cursor.fetchall()
-            serialized_customers = [serialize_row(c) for c in customers]
-            return jsonify(serialized_customers)
+            cursor.execute(customers_sql)
+            return jsonify(cursor.fetchall())
     except Exception as e:
         print(f"Error in get_customers: {e}")
         traceback.print_exc()
@@ -747,50 +1855,68 @@ def get_customers():
 # Dashboard Routes
 @app.route('/api/dashboard/stats', methods=['GET'])
 def get_dashboard_stats():
-    """Get dashboard statistics."""
+    """Get dashboard statistics from the maintained counters and the top sellers tracker.
+
+    top_products ranks all-time sales; top_products_windows covers the last hour
+    and today. ?check_top_products=1 also runs the ranking in SQL and reports
+    whether the two agree.
+    """
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor(dictionary=True)
 
-            # Get statistics
-            stats = {}
-
-            cursor.execute("SELECT COUNT(*) as count FROM products")
-            stats['total_products'] = cursor.fetchone()['count']
-
-            cursor.execute("SELECT COUNT(*) as count FROM orders")
-            stats['total_orders'] = cursor.fetchone()['count']
+            # Counters maintained by the write routes
+            cursor.execute("SELECT name, value FROM dashboard_counters")
+            counters = {row['name']: row['value'] for row in cursor.fetchall()}
 
-            cursor.execute("SELECT COUNT(*) as count FROM customers")
-            stats['total_customers'] = cursor.fetchone()['count']
-
-            cursor.execute("SELECT COALESCE(SUM(total_amount), 0) as total FROM orders WHERE status = 'completed'")
-            stats['total_revenue'] = safe_float(cursor.fetchone()['total'])
-
-            # Pending orders count
-            cursor.execute("SELECT COUNT(*) as count FROM orders WHERE status = 'pending'")
-            stats['pending_orders'] = cursor.fetchone()['count']
+            stats = {name: safe_int(counters.get(name)) for name in DASHBOARD_COUNTERS}
+            stats['total_revenue'] = safe_float(counters.get('total_revenue'))
 
             # Recent orders
             cursor.execute("""
                 SELECT o.*, c.name as customer_name
                 FROM orders o
                 LEFT JOIN customers c ON o.customer_id = c.id
-                ORDER BY o.order_date DESC
+                ORDER BY o.order_date DESC, o.id DESC
                 LIMIT 5
             """)
-            stats['recent_orders'] = [serialize_row(order) for order in cursor.fetchall()]
-
-            # Top selling products
-            cursor.execute("""
-                SELECT p.name, p.image_url, SUM(oi.quantity) as total_sold, SUM(oi.quantity * oi.price) as revenue
-                FROM order_items oi
-                JOIN products p ON oi.product_id = p.id
-                GROUP BY p.id
-                ORDER BY total_sold DESC
-                LIMIT 5
-            """)
-            stats['top_products'] = [serialize_row(product) for product in cursor.fetchall()]
+            stats['recent_orders'] = cursor.fetchall()
+
+            # Top selling products, ranked in memory
+            if top_sellers.needs_load():
+                load_top_sellers(conn.cursor())
+            now = datetime.now()
+            rankings = {
+                'all_time': top_sellers.top(TOP_PRODUCTS_LIMIT),
+                'last_hour': top_sellers.top(TOP_PRODUCTS_LIMIT, since=now - timedelta(hours=1)),
+                'today': top_sellers.top(TOP_PRODUCTS_LIMIT, since=now.replace(hour=0, minute=0, second=0, microsecond=0))
+            }
+            product_ids = sorted({row[0] for ranking in rankings.values() for row in ranking})
+            products = {}
+            if product_ids:
+                cursor.execute(
+                    f"SELECT id, name, image_url FROM products WHERE id IN ({in_placeholders(product_ids)})",
+                    product_ids
+                )
+                products = {row['id']: row for row in cursor.fetchall()}
+
+            def describe(ranking):
+                return [{'product_id': product_id, 'name': products[product_id]['name'],
+                         'image_url': products[product_id]['image_url'], 'total_sold': units, 'revenue': revenue}
+                        for product_id, units, revenue in ranking if product_id in products]
+
+            stats['top_products'] = describe(rankings['all_time'])
+            stats['top_products_windows'] = {name: describe(rankings[name]) for name in ('last_hour', 'today')}
+
+            if request.args.get('check_top_products', '').lower() in ('1', 'true', 'yes'):
+                check_cursor = conn.cursor()
+                check_cursor.execute(product_sales_sql(limit=TOP_PRODUCTS_LIMIT))
+                expected = [(row[0], int(row[1]), to_cents(row[2])) for row in check_cursor.fetchall()]
+                stats['top_products_check'] = {
+                    'matches': expected == rankings['all_time'],
+                    'sql': [{'product_id': product_id, 'total_sold': units, 'revenue': revenue}
+                            for product_id, units, revenue in expected]
+                }
 
             return jsonify(stats)
 
@@ -799,36 +1925,166 @@ def get_dashboard_stats():
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+# Reports Routes
+@app.route('/api/reports/sales', methods=['GET'])
+def get_sales_report():
+    """Order count, units sold and revenue per hour or day, read from the sales rollups.
+
+    Query parameters: from/to (ISO dates or datetimes, default the last
+    REPORT_DEFAULT_DAYS days; hour resolution), granularity (hour or day),
+    product_id, and status (comma-separated, default every status but
+    cancelled). Periods without sales are omitted.
+    """
+    try:
+        try:
+            end = parse_datetime_arg(request.args['to'], end_of_range=True) if request.args.get('to') else datetime.now()
+            start = (parse_datetime_arg(request.args['from']) if request.args.get('from')
+                     else end - timedelta(days=REPORT_DEFAULT_DAYS))
+        except ValueError:
+            return jsonify({'error': 'from/to must be ISO dates or datetimes'}), 400
+        granularity = request.args.get('granularity', 'hour')
+        if granularity not in REPORT_GRANULARITIES:
+            return jsonify({'error': f"granularity must be one of: {', '.join(REPORT_GRANULARITIES)}"}), 400
+        product_id = request.args.get('product_id')
+        if product_id is not None:
+            product_id = safe_int(product_id, None)
+            if product_id is None:
+                return jsonify({'error': 'product_id must be an integer'}), 400
+        try:
+            statuses = parse_status_arg(request.args.get('status', '')) or list(REPORT_DEFAULT_STATUSES)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        conditions = ["hour_start >= %s", "hour_start < %s", f"status IN ({in_placeholders(statuses)})"]
+        params = [start.replace(minute=0, second=0, microsecond=0), end, *statuses]
+        table = 'sales_hourly'
+        if product_id is not None:
+            table = 'product_sales_hourly'
+            conditions.append("product_id = %s")
+            params.append(product_id)
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT hour_start, SUM(order_count), SUM(units), SUM(revenue)
+                FROM {table}
+                WHERE {' AND '.join(conditions)}
+                GROUP BY hour_start
+                ORDER BY hour_start
+            """, params)
+            rows = cursor.fetchall()
+
+        # Hourly rows are summed into days here rather than with dialect-specific date SQL
+        buckets = {}
+        for hour_start, order_count, units, revenue in rows:
+            period = hour_start if granularity == 'hour' else hour_start.date()
+            bucket = buckets.setdefault(period, {'period': period, 'orders': 0, 'units': 0, 'revenue': Decimal(0)})
+            bucket['orders'] += int(order_count)
+            bucket['units'] += int(units)
+            bucket['revenue'] += to_cents(revenue)
+        buckets = [bucket for bucket in buckets.values() if bucket['orders']]
+
+        return jsonify({
+            'from': start,
+            'to': end,
+            'granularity': granularity,
+            'product_id': product_id,
+            'statuses': statuses,
+            'buckets': buckets,
+            'totals': {
+                'orders': sum(bucket['orders'] for bucket in buckets),
+                'units': sum(bucket['units'] for bucket in buckets),
+                'revenue': sum((bucket['revenue'] for bucket in buckets), Decimal(0))
+            }
+        })
+
+    except Exception as e:
+        print(f"Error in get_sales_report: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
 # Frontend Routes
+def _admin_page():
+    """Locate the admin page: templates/admin.html, else static/Admin.html."""
+    for candidate in ('templates/admin.html', 'static/Admin.html'):
+        if os.path.exists(os.path.join(app.root_path, candidate)):
+            return candidate
+    return 'templates/admin.html'
+
+static_assets = StaticAssets(app.root_path, STATIC_EXTENSIONS, STATIC_DIRECTORIES,
+                             aliases={'admin': _admin_page()})
+static_assets.load()
+
+def asset_response(name):
+    """Serve a cached asset with compression, ETag and Cache-Control; None if not cached."""
+    asset = static_assets.get(name)
+    if asset is None:
+        return None
+
+    encoding, body = asset.select(request.accept_encodings)
+    response = Response(body, mimetype=asset.mimetype)
+    response.set_etag(asset.etag if encoding == 'identity' else f"{asset.etag}-{encoding}")
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+
+    if asset.mimetype == 'text/html':
+        response.headers['Cache-Control'] = 'no-cache'  # pages always revalidate
+    elif request.args.get('v') == asset.etag:
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}'
+    return response.make_conditional(request)
+
 @app.route('/admin')
 def serve_admin():
     """Serve the admin panel."""
-    template_path = os.path.join(app.root_path, 'templates', 'admin.html')
-    static_path = os.path.join(app.static_folder, 'Admin.html')
-
-    if os.path.exists(template_path):
-        return render_template('admin.html')
-    elif os.path.exists(static_path):
-        with open(static_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    else:
+    response = asset_response('admin')
+    if response is None:
         return """
         <h1>Admin panel not found</h1>
         <p>Please ensure admin.html exists in the templates or static folder.</p>
         """, 404
+    return response
 
 @app.route('/')
 def serve_home():
     """Serve the customer home page."""
-    index_path = os.path.join(app.root_path, 'Index.html')
-    if os.path.exists(index_path):
-        with open(index_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    else:
+    response = asset_response('Index.html')
+    if response is None:
         return """
         <h1>Welcome to Restaurant Management System</h1>
         <p><a href="/admin">Go to Admin Panel</a></p>
         """, 404
+    return response
+
+@app.route('/<path:filename>')
+def serve_asset(filename):
+    """Serve the site's pages, stylesheets, scripts and images from memory."""
+    response = asset_response(filename)
+    if response is None:
+        abort(404)
+    return response
+
+# Uploaded Images
+@app.route('/static/uploads/<path:filename>')
+def serve_upload(filename):
+    """Serve an uploaded image as its best available variant.
+
+    ?w= asks for a display width (default IMAGE_DEFAULT_WIDTH); WebP is
+    preferred when the Accept header lists it. Originals are served until
+    their variants have been generated.
+    """
+    filename = secure_filename(filename)
+    width = safe_int(request.args.get('w'), IMAGE_DEFAULT_WIDTH)
+    accept_webp = 'image/webp' in request.accept_mimetypes.values()
+    chosen = image_pipeline.best_variant(filename, width=width, accept_webp=accept_webp)
+
+    # Variants never change; an original may soon be replaced by a variant
+    max_age = 86400 if chosen != filename else 60
+    response = send_from_directory(app.config['UPLOAD_FOLDER'], chosen, max_age=max_age)
+    response.headers['Vary'] = 'Accept'
+    return response
 
 # Health check endpoint
 @app.route('/api/health', methods=['GET'])
@@ -841,6 +2097,15 @@ def health_check():
             return jsonify({
                 'status': 'healthy',
                 'database': 'connected',
+                'driver': DB_DRIVER,
+                'pool': db_pool.stats(),
+                'catalog_cache': product_catalog.stats(),
+                'product_index': product_index.stats(),
+                'order_events': {**order_events.stats(), **order_relay.stats()},
+                'order_writer': order_writer.stats(),
+                'customer_cache': customer_cache.stats(),
+                'top_sellers': top_sellers.stats(),
+                'static_assets': static_assets.stats(),
                 'timestamp': datetime.now().isoformat()
             })
     except Exception as e:
@@ -848,10 +2113,172 @@ def health_check():
             'status': 'unhealthy',
             'database': 'disconnected',
             'error': str(e),
+            'pool': db_pool.stats(),
             'timestamp': datetime.now().isoformat()
         }), 500
 
+# Metrics endpoint (Prometheus text format)
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Request, query and serialization metrics for this process."""
+    pool = db_pool.stats()
+    catalog = product_catalog.stats()
+    events = order_events.stats()
+    customers = customer_cache.stats()
+    gauges = {
+        'db_pool_size': ('Maximum open connections in the pool.', pool['size']),
+        'db_pool_in_use': ('Connections currently checked out.', pool['in_use']),
+        'db_pool_idle': ('Idle pooled connections.', pool['idle']),
+        'order_event_subscribers': ('Open order event streams.', events['subscribers']),
+    }
+    counters = {
+        'db_pool_waits_total': ('Checkouts that had to wait for a free connection.', pool['waits']),
+        'db_pool_timeouts_total': ('Checkouts that timed out.', pool['timeouts']),
+        'catalog_cache_hits_total': ('Product catalog cache hits.', catalog['hits']),
+        'catalog_cache_misses_total': ('Product catalog cache misses.', catalog['misses']),
+        'customer_cache_hits_total': ('Order-time customer lookups answered from memory.', customers['hits']),
+        'customer_cache_misses_total': ('Order-time customer lookups that went to the database.', customers['misses']),
+    }
+    return Response(request_metrics.render(gauges, counters), mimetype='text/plain; version=0.0.4')
+
+# Command Line Interface (flask --app app <command>)
+@app.cli.group('stats')
+def stats_cli():
+    """Maintain the dashboard counters."""
+
+@stats_cli.command('check')
+def stats_check_command():
+    """Compare the dashboard counters with a full recount."""
+    with get_db_connection() as conn:
+        mismatches = check_dashboard_stats(conn.cursor())
+    if mismatches:
+        print("❌ Dashboard counters are out of date:")
+        for mismatch in mismatches:
+            print(f"   - {mismatch}")
+        print("Run 'flask --app app stats rebuild' to fix them.")
+        raise SystemExit(1)
+    print("✓ Dashboard counters match the database")
+
+@stats_cli.command('rebuild')
+def stats_rebuild_command():
+    """Recompute the dashboard counters from the base tables."""
+    with get_db_connection() as conn:
+        rebuild_dashboard_stats(conn.cursor())
+        conn.commit()
+    print("✓ Dashboard counters rebuilt")
+
+@app.cli.group('db')
+def db_cli():
+    """Manage the database schema."""
+
+@db_cli.command('status')
+def db_status_command():
+    """List schema migrations and whether each has been applied."""
+    with get_db_connection() as conn:
+        for version, description, applied_at in migration_status(conn):
+            state = f"applied {applied_at}" if applied_at else "pending"
+            print(f"{'✓' if applied_at else '•'} {version:>3}  {description}  ({state})")
+
+@db_cli.command('upgrade')
+def db_upgrade_command():
+    """Apply any pending schema migrations."""
+    with get_db_connection() as conn:
+        applied = apply_migrations(conn)
+    print(f"✓ Applied {len(applied)} migration(s)" if applied else "✓ Schema is up to date")
+
+@app.cli.group('products')
+def products_cli():
+    """Bulk import and export products."""
+
+@products_cli.command('import')
+@click.argument('source', type=click.File('rb'))
+@click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS),
+              help='Input format (default: from the file extension).')
+@click.option('--batch-size', type=int, default=IMPORT_BATCH_SIZE, show_default=True,
+              help='Rows inserted per transaction.')
+@click.option('--dry-run', is_flag=True, help='Only validate the rows.')
+def products_import_command(source, fmt, batch_size, dry_run):
+    """Import products from a CSV, NDJSON or JSON array file (e.g. products.json)."""
+    fmt = fmt or detect_format(source.name)
+    if fmt is None:
+        print("❌ Can't tell the file format from its name; pass --format")
+        raise SystemExit(1)
+    with get_db_connection() as conn:
+        summary = import_products(conn, read_records(source, fmt), batch_size=batch_size, dry_run=dry_run)
+    verb = 'would be imported' if dry_run else 'imported'
+    print(f"✓ {summary['imported']} product(s) {verb}, {summary['failed']} row(s) failed")
+    for error in summary['errors']:
+        print(f"   - row {error['row']}: {error['error']}")
+    if summary['failed']:
+        raise SystemExit(1)
+
+@products_cli.command('export')
+@click.argument('destination', type=click.File('w'), default='-')
+@click.option('--format', 'fmt', type=click.Choice(EXPORT_FORMATS), default='ndjson', show_default=True)
+def products_export_command(destination, fmt):
+    """Write every product to a file (default: stdout)."""
+    batches = iter_query_batches("SELECT * FROM products ORDER BY id")
+    if fmt == 'csv':
+        for chunk in iter_csv(batches):
+            destination.write(chunk)
+    else:
+        for rows in batches:
+            destination.write(''.join(app.json.dumps(row) + '\n' for row in rows))
+
+@app.cli.group('orders')
+def orders_cli():
+    """Manage order history."""
+
+@orders_cli.command('archive')
+@click.option('--days', type=int, default=ARCHIVE_AFTER_DAYS, show_default=True,
+              help='Archive finished orders older than this many days.')
+@click.option('--dry-run', is_flag=True, help='Only count the orders that would be archived.')
+def orders_archive_command(days, dry_run):
+    """Move old completed/cancelled orders into the archive tables."""
+    with get_db_connection() as conn:
+        if dry_run:
+            cursor = conn.cursor()
+            cutoff = datetime.now() - timedelta(days=days)
+            cursor.execute(f"SELECT COUNT(*) FROM ({archivable_orders_sql()}) a", (*ARCHIVE_STATUSES, cutoff))
+            print(f"• {cursor.fetchone()[0]} order(s) older than {days} days would be archived")
+            return
+        moved = archive_orders(conn, older_than_days=days)
+    print(f"✓ Archived {moved} order(s) older than {days} days")
+
+@app.cli.group('reports')
+def reports_cli():
+    """Maintain the sales report rollups."""
+
+@reports_cli.command('backfill')
+@click.option('--chunk-size', type=int, default=ROLLUP_BACKFILL_CHUNK, show_default=True,
+              help='Orders read per pass.')
+def reports_backfill_command(chunk_size):
+    """Rebuild the hourly sales rollups from orders, order items and the archive."""
+    with get_db_connection() as conn:
+        order_count = rebuild_sales_rollups(conn.cursor(), chunk_size=chunk_size)
+        conn.commit()
+    print(f"✓ Rebuilt sales rollups from {order_count} order(s)")
+
+@app.cli.group('images')
+def images_cli():
+    """Manage uploaded images."""
+
+@images_cli.command('process')
+def images_process_command():
+    """Generate resized/WebP variants for uploads that don't have them yet."""
+    if not image_pipeline.enabled:
+        print("❌ Pillow is not installed; run 'pip install Pillow' first")
+        raise SystemExit(1)
+    folder = app.config['UPLOAD_FOLDER']
+    futures = [image_pipeline.submit(name) for name in sorted(os.listdir(folder))
+               if allowed_file(name) and not image_pipeline.is_variant(name)]
+    futures = [f for f in futures if f is not None]
+    for future in futures:
+        future.result()
+    print(f"✓ Processed {len(futures)} image(s)")
+
 # Application Entry Point
+# Development server only; production runs gunicorn -c gunicorn.conf.py app:app
 if __name__ == '__main__':
     try:
         initialize_database()
@@ -862,7 +2289,8 @@ if __name__ == '__main__':
         print("🏠 Customer Site:  http://localhost:5000/")
         print("💚 Health Check:   http://localhost:5000/api/health")
         print("=" * 60)
-        app.run(debug=True, port=5000, host='0.0.0.0')
+        static_assets.reload = True  # development server: pick up edited files
+        app.run(debug=os.environ.get('FLASK_DEBUG') == '1', port=5000, host='0.0.0.0')
     except Exception as e:
         print(f"❌ Failed to start application: {e}")
         traceback.print_exc()
\ No newline at end of file
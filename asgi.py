@@ -0,0 +1,245 @@
+"""
+Restaurant Management System - Asyncio Serving Mode
+ASGI entry point, e.g. `uvicorn asgi:application --port 5000`.
+
+Requests run through the same Flask views as the WSGI server, on the async
+connection pool's worker threads, so the product, menu, order, customer and
+dashboard handlers are shared by both modes. The pool admits as many requests
+at a time as it has connections. The others wait on the event loop and don't
+hold a thread. Pages, assets and uploads don't use the database, so they run
+on a small executor of their own instead of taking a connection slot.
+/api/orders/stream is served on the event loop itself, so an open event
+stream is a coroutine rather than a worker thread.
+"""
+
+import asyncio
+import contextvars
+import io
+import signal
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.wrappers import Request
+
+import app
+from db_pool import AsyncConnectionPool
+from order_events import SSE_HEADERS, SSE_KEEPALIVE, SSE_PREAMBLE, read_sse
+
+EVENT_STREAM_PATH = '/api/orders/stream'
+DATABASE_PATH_PREFIX = '/api/'  # requests outside it never touch the database
+PAGE_WORKERS = 4  # threads serving pages, assets and uploads
+
+
+def wsgi_environ(scope, body):
+    """Build a WSGI environ for an ASGI HTTP scope and its request body."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name, value = name.decode('latin-1'), value.decode('latin-1')
+        if name == 'content-type':
+            key = 'CONTENT_TYPE'
+        elif name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def read_body(receive):
+    """Return the full request body, or None if the client disconnected first."""
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+class AsyncApp:
+    """ASGI application that runs a WSGI app on an AsyncConnectionPool."""
+
+    def __init__(self, wsgi_app, pool, page_workers=PAGE_WORKERS):
+        self.wsgi_app = wsgi_app
+        self.pool = pool
+        self.page_executor = ThreadPoolExecutor(max_workers=page_workers, thread_name_prefix='pages')
+        self.initialize_database = True  # cleared by gunicorn.conf.py, which initializes in the master
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            if scope['method'] == 'GET' and scope['path'] == EVENT_STREAM_PATH:
+                await self._order_events(scope, receive, send)
+            else:
+                await self._dispatch(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if self.initialize_database and not await loop.run_in_executor(None, app.initialize_database):
+                    await send({'type': 'lifespan.startup.failed', 'message': 'Database initialization failed'})
+                else:
+                    self._close_streams_on_exit(loop)
+                    await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                app.order_events.close()
+                app.order_writer.shutdown()
+                self.pool.shutdown()
+                self.page_executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    def _close_streams_on_exit(loop):
+        """End open order event streams as soon as the server is asked to stop.
+
+        The ASGI server waits for open responses before it sends the lifespan
+        shutdown, and an event stream never finishes by itself. Its SIGINT and
+        SIGTERM handlers are wrapped, so it still shuts down as usual.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            handler = signal.getsignal(signum)
+            if not callable(handler):
+                continue
+
+            def drain(signum, frame, handler=handler):
+                loop.call_soon_threadsafe(app.order_events.close)
+                handler(signum, frame)
+
+            signal.signal(signum, drain)
+
+    async def _dispatch(self, scope, receive, send):
+        body = await read_body(receive)
+        if body is None:
+            return
+        loop = asyncio.get_running_loop()
+
+        def send_from_thread(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        environ = wsgi_environ(scope, body)
+        if scope['path'].startswith(DATABASE_PATH_PREFIX):
+            buffered = await self.pool.run(self._call_wsgi, environ, send_from_thread)
+        else:
+            context = contextvars.copy_context()
+            buffered = await loop.run_in_executor(self.page_executor, context.run, self._call_wsgi,
+                                                  environ, send_from_thread)
+        if buffered is not None:
+            response_start, body = buffered
+            await send(response_start)
+            await send({'type': 'http.response.body', 'body': body})
+
+    def _call_wsgi(self, environ, send):
+        """Run the WSGI app on a worker thread (database pool or page executor).
+
+        Returns (start message, body) for a response with a Content-Length, to be
+        sent from the event loop. Streamed responses are passed to the ASGI server
+        chunk by chunk from this thread, and None is returned.
+        """
+        response_start = {}
+
+        def start_response(status, headers, exc_info=None):
+            response_start.update({
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+            })
+
+        result = self.wsgi_app(environ, start_response)
+        try:
+            if any(name == b'content-length' for name, _ in response_start['headers']):
+                return response_start, b''.join(result)
+            send(response_start)
+            for chunk in result:
+                if chunk:
+                    send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+    async def _order_events(self, scope, receive, send):
+        """Asyncio version of app.stream_order_events()."""
+        position = app.order_stream_position(Request(wsgi_environ(scope, b'')))
+        await self.pool.run(app.order_relay.catch_up, position)  # may read the event log
+
+        app.request_metrics.begin('GET', EVENT_STREAM_PATH)
+        app.request_metrics.finish(200)
+        headers = {**SSE_HEADERS, 'Access-Control-Allow-Origin': '*'}
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()
+        ]})
+
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+
+        def notify():
+            loop.call_soon_threadsafe(wake.set)
+
+        async def send_text(text):
+            await send({'type': 'http.response.body', 'body': text.encode('utf-8'), 'more_body': True})
+
+        disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+        app.order_events.subscribe()
+        app.order_events.add_listener(notify)
+        try:
+            await send_text(SSE_PREAMBLE)
+            while not disconnected.done() and not app.order_events.closed:
+                wake.clear()
+                text, position = read_sse(app.order_events, position)
+                if text:
+                    await send_text(text)
+                    continue
+                woken = asyncio.ensure_future(wake.wait())
+                done, _ = await asyncio.wait({woken, disconnected}, timeout=app.ORDER_EVENTS_KEEPALIVE,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                woken.cancel()
+                if not done:
+                    await send_text(SSE_KEEPALIVE)
+            if not disconnected.done():
+                await send({'type': 'http.response.body', 'body': b''})  # shutting down: end the stream
+        finally:
+            app.order_events.remove_listener(notify)
+            app.order_events.unsubscribe()
+            disconnected.cancel()
+
+
+application = AsyncApp(app.app.wsgi_app, AsyncConnectionPool(app.db_pool))
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ uvicorn is not installed; run 'pip install uvicorn' first")
+        raise SystemExit(1)
+    uvicorn.run(application, host='0.0.0.0', port=5000)
@@ -0,0 +1,4 @@
+"""
+Restaurant Management System - Benchmarks
+Run from the project root, e.g. ``python -m benchmarks.bench_menus``.
+"""
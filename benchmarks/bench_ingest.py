@@ -0,0 +1,80 @@
+"""
+Benchmark order ingestion throughput with and without group commit.
+
+Concurrent clients post orders for a fixed time, first with one transaction
+per order, then with ORDER_GROUP_COMMIT batching them on the writer thread.
+On a server that fsyncs every commit the gap grows with concurrency.
+
+Usage: python -m benchmarks.bench_ingest [--concurrency N] [--duration S]
+"""
+
+import argparse
+import threading
+import time
+
+import app
+from benchmarks.bench_orders import order_payload, seed
+from benchmarks.common import print_table, use_bench_database
+
+BASKET_SIZE = 3
+
+
+def run(concurrency, duration, payload):
+    """Post orders from `concurrency` threads for `duration` seconds; return (orders, errors, latencies)."""
+    stop_at = time.monotonic() + duration
+    lock = threading.Lock()
+    totals = {'orders': 0, 'errors': 0}
+    latencies = []
+
+    def worker():
+        client = app.app.test_client()
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            response = client.post('/api/orders', json=payload)
+            elapsed = time.perf_counter() - start
+            with lock:
+                if response.status_code == 201:
+                    totals['orders'] += 1
+                    latencies.append(elapsed)
+                else:
+                    totals['errors'] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return totals['orders'], totals['errors'], latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32], help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per case')
+    args = parser.parse_args()
+
+    use_bench_database()
+    payload = order_payload(seed(), BASKET_SIZE)
+    # Let every client hold a connection in the per-order case too
+    app.db_pool.size = max(app.db_pool.size, max(args.concurrency))
+    rows = []
+
+    for concurrency in args.concurrency:
+        for label, group_commit in (('per-order commit', False), ('group commit', True)):
+            app.ORDER_GROUP_COMMIT = group_commit
+            orders, errors, latencies = run(concurrency, args.duration, payload)
+            p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+            p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0
+            rows.append((concurrency, label, round(orders / args.duration, 1), errors,
+                         round(p50, 2), round(p95, 2)))
+
+    writer = app.order_writer.stats()
+    app.order_writer.shutdown()
+    print_table(('clients', 'mode', 'orders/s', 'errors', 'p50 ms', 'p95 ms'), rows)
+    print(f"\nGroup commit: {writer['batches']} batches, avg {writer['avg_batch']} orders, "
+          f"largest {writer['largest_batch']}")
+
+
+if __name__ == '__main__':
+    main()
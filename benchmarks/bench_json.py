@@ -0,0 +1,100 @@
+"""
+Microbenchmark JSON encoding of list responses (no database needed).
+
+Compares the previous serialize_row() + jsonify path with RowJSONProvider,
+using the standard library encoder and, when installed, orjson.
+
+Usage: python -m benchmarks.bench_json [--repeat N]
+"""
+
+import argparse
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+import app
+import json_provider
+from benchmarks.common import measure, print_table
+
+ROW_COUNTS = (100, 1000, 10000)
+
+
+def serialize_decimal(obj):
+    """Convert Decimal objects to float for JSON serialization (the previous app.py helper)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    elif isinstance(obj, datetime):
+        return obj.isoformat()
+    return obj
+
+
+def serialize_row(row):
+    """Serialize a database row dictionary (the previous app.py helper)."""
+    if isinstance(row, dict):
+        return {k: serialize_decimal(v) for k, v in row.items()}
+    return row
+
+
+def make_rows(count):
+    """Build order-like rows as the database driver returns them."""
+    start = datetime(2025, 11, 3, 12, 0, 0)
+    return [{
+        'id': i,
+        'customer_id': i % 97,
+        'customer_name': f"Customer {i % 97}" if i % 10 else f"Café {i % 97}",
+        'customer_email': f"customer{i % 97}@example.com",
+        'customer_phone': f"+1555{i % 97:07d}",
+        'total_amount': Decimal('12.99') * (1 + i % 5),
+        'status': ('pending', 'preparing', 'completed', 'cancelled')[i % 4],
+        'order_date': start + timedelta(minutes=i),
+    } for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help='timed encodings per case')
+    args = parser.parse_args()
+
+    legacy = DefaultJSONProvider(app.app)
+    fast = json_provider.RowJSONProvider(app.app)
+    installed_orjson = json_provider.orjson
+
+    def encode_legacy(rows):
+        return legacy.response([serialize_row(row) for row in rows]).get_data()
+
+    def encode_stdlib(rows):
+        json_provider.orjson = None
+        try:
+            return fast.response(rows).get_data()
+        finally:
+            json_provider.orjson = installed_orjson
+
+    def encode_orjson(rows):
+        return fast.response(rows).get_data()
+
+    cases = [('serialize_row + jsonify (before)', encode_legacy),
+             ('RowJSONProvider, json', encode_stdlib)]
+    if installed_orjson is not None:
+        cases.append(('RowJSONProvider, orjson', encode_orjson))
+    else:
+        print("orjson is not installed; skipping the orjson case (pip install orjson)")
+
+    rows_out = []
+    with app.app.app_context():
+        for count in ROW_COUNTS:
+            rows = make_rows(count)
+            # The encoders agree on the decoded values (orjson keeps non-ASCII as raw UTF-8)
+            expected = json.loads(encode_legacy(rows))
+            for label, func in cases[1:]:
+                assert json.loads(func(rows)) == expected, label
+            for label, func in cases:
+                timing = measure(lambda: func(rows), repeat=args.repeat)
+                rows_out.append((count, label, timing['p50_ms'], timing['p95_ms']))
+
+    print_table(('rows', 'encoder', 'p50 ms', 'p95 ms'), rows_out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark GET /api/menus: query count and latency at 10, 100 and 1,000 menus.
+
+Compares the current endpoint (menus + one grouped product query) with the
+previous one-query-per-menu implementation.
+
+Usage: python -m benchmarks.bench_menus [--repeat N]
+"""
+
+import argparse
+
+import app
+from benchmarks.bench_json import serialize_row
+from benchmarks.common import count_queries, measure, print_table, reset_tables, use_bench_database
+
+MENU_COUNTS = (10, 100, 1000)
+PRODUCT_COUNT = 50
+PRODUCTS_PER_MENU = 8
+
+
+def seed(menu_count):
+    """Replace the benchmark data with menu_count menus of PRODUCTS_PER_MENU products."""
+    with app.get_db_connection() as conn:
+        cursor = conn.cursor()
+        reset_tables(cursor)
+        cursor.executemany(
+            "INSERT INTO products (name, category, description, price, image_url) VALUES (%s, %s, %s, %s, %s)",
+            [(f"Product {i}", 'Bench', 'Benchmark product', 9.99, '') for i in range(PRODUCT_COUNT)]
+        )
+        cursor.execute("SELECT id FROM products")
+        product_ids = [row[0] for row in cursor.fetchall()]
+        cursor.executemany(
+            "INSERT INTO menus (name, description, is_visible, category) VALUES (%s, %s, %s, %s)",
+            [(f"Menu {i}", 'Benchmark menu', True, 'main') for i in range(menu_count)]
+        )
+        cursor.execute("SELECT id FROM menus")
+        links = []
+        for index, (menu_id,) in enumerate(cursor.fetchall()):
+            for offset in range(PRODUCTS_PER_MENU):
+                links.append((menu_id, product_ids[(index + offset) % len(product_ids)]))
+        cursor.executemany("INSERT INTO menu_products (menu_id, product_id) VALUES (%s, %s)", links)
+        conn.commit()
+
+
+def legacy_get_menus():
+    """The previous N+1 implementation, kept here as the baseline."""
+    with app.get_db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM menus ORDER BY created_at DESC")
+        menus = cursor.fetchall()
+        for menu in menus:
+            cursor.execute("""
+                SELECT p.* FROM products p
+                JOIN menu_products mp ON p.id = mp.product_id
+                WHERE mp.menu_id = %s
+                ORDER BY p.name
+            """, (menu['id'],))
+            menu['products'] = [serialize_row(p) for p in cursor.fetchall()]
+        return app.jsonify([serialize_row(menu) for menu in menus])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help='timed calls per case')
+    args = parser.parse_args()
+
+    # Serve the baseline through Flask too so both cases pay the same request overhead
+    app.app.add_url_rule('/bench/legacy-menus', view_func=legacy_get_menus)
+    use_bench_database()
+    client = app.app.test_client()
+    rows = []
+
+    for menu_count in MENU_COUNTS:
+        seed(menu_count)
+        cases = (
+            ('n+1 (before)', lambda: client.get('/bench/legacy-menus')),
+            ('grouped (after)', lambda: client.get('/api/menus')),
+        )
+        for label, func in cases:
+            with count_queries() as counter:
+                func()
+            timing = measure(func, repeat=args.repeat)
+            rows.append((menu_count, label, counter['queries'], timing['p50_ms'], timing['p95_ms']))
+
+    print_table(('menus', 'implementation', 'queries', 'p50 ms', 'p95 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
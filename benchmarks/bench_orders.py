@@ -0,0 +1,121 @@
+"""
+Benchmark POST /api/orders: latency and query count against basket size.
+
+Compares the current endpoint (one IN price lookup + one multi-row insert)
+with the previous two-lookups-per-item implementation.
+
+Usage: python -m benchmarks.bench_orders [--repeat N]
+"""
+
+import argparse
+
+import app
+from benchmarks.common import count_queries, measure, print_table, reset_tables, use_bench_database
+
+BASKET_SIZES = (1, 5, 20, 50)
+PRODUCT_COUNT = 50
+
+
+def seed():
+    """Replace the benchmark data with PRODUCT_COUNT products."""
+    with app.get_db_connection() as conn:
+        cursor = conn.cursor()
+        reset_tables(cursor)
+        cursor.executemany(
+            "INSERT INTO products (name, category, description, price, image_url) VALUES (%s, %s, %s, %s, %s)",
+            [(f"Product {i}", 'Bench', 'Benchmark product', 4.5 + i, '') for i in range(PRODUCT_COUNT)]
+        )
+        cursor.execute("SELECT id FROM products")
+        product_ids = [row[0] for row in cursor.fetchall()]
+        conn.commit()
+    return product_ids
+
+
+def order_payload(product_ids, basket_size):
+    return {
+        'customer_name': 'Bench Customer',
+        'customer_email': 'bench@example.com',
+        'customer_phone': '+10000000000',
+        'items': [{'product_id': product_ids[i % len(product_ids)], 'quantity': 1 + i % 3}
+                  for i in range(basket_size)]
+    }
+
+
+def legacy_create_order():
+    """The previous implementation, kept here as the baseline."""
+    data = app.request.get_json()
+    with app.get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT id FROM customers WHERE email = %s OR phone = %s",
+            (data['customer_email'], data['customer_phone'])
+        )
+        customer = cursor.fetchone()
+        if customer:
+            customer_id = customer[0]
+        else:
+            cursor.execute(
+                "INSERT INTO customers (name, email, phone) VALUES (%s, %s, %s)",
+                (data['customer_name'], data['customer_email'], data['customer_phone'])
+            )
+            customer_id = cursor.lastrowid
+
+        total_amount = 0
+        for item in data['items']:
+            cursor.execute("SELECT price FROM products WHERE id = %s", (item['product_id'],))
+            product = cursor.fetchone()
+            if product:
+                total_amount += float(product[0]) * item['quantity']
+
+        cursor.execute(
+            "INSERT INTO orders (customer_id, total_amount, status) VALUES (%s, %s, %s)",
+            (customer_id, total_amount, 'pending')
+        )
+        order_id = cursor.lastrowid
+
+        for item in data['items']:
+            cursor.execute("SELECT price FROM products WHERE id = %s", (item['product_id'],))
+            product = cursor.fetchone()
+            if product:
+                cursor.execute(
+                    "INSERT INTO order_items (order_id, product_id, quantity, price) VALUES (%s, %s, %s, %s)",
+                    (order_id, item['product_id'], item['quantity'], float(product[0]))
+                )
+        conn.commit()
+    return app.jsonify({'order_id': order_id, 'total_amount': total_amount}), 201
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50, help='timed orders per case')
+    args = parser.parse_args()
+
+    # Serve the baseline through Flask too so both cases pay the same request overhead
+    app.app.add_url_rule('/bench/legacy-orders', view_func=legacy_create_order, methods=['POST'])
+    use_bench_database()
+    product_ids = seed()
+    client = app.app.test_client()
+    rows = []
+
+    for basket_size in BASKET_SIZES:
+        payload = order_payload(product_ids, basket_size)
+
+        def create_order(url):
+            response = client.post(url, json=payload)
+            assert response.status_code == 201, response.get_data(as_text=True)
+
+        cases = (
+            ('per-item (before)', lambda: create_order('/bench/legacy-orders')),
+            ('batched (after)', lambda: create_order('/api/orders')),
+        )
+        for label, func in cases:
+            with count_queries() as counter:
+                func()
+            timing = measure(func, repeat=args.repeat)
+            rows.append((basket_size, label, counter['queries'], timing['p50_ms'], timing['p95_ms']))
+
+    print_table(('items', 'implementation', 'queries', 'p50 ms', 'p95 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
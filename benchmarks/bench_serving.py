@@ -0,0 +1,247 @@
+"""
+Benchmark concurrent request throughput: threaded WSGI vs the asyncio mode.
+
+Clients request a read mix (products, menus, orders, customers, dashboard)
+for a fixed time. In the sync mode each request runs on one of --threads
+worker threads, like a threaded WSGI server. In the async mode it goes
+through asgi.AsyncApp and waits on the event loop for one of the pool's
+connections. --streams keeps that many /api/orders/stream clients connected
+during each run. --db-latency adds a delay to every query, standing in for
+the network round trip to a MariaDB server.
+
+Usage: python -m benchmarks.bench_serving [--clients N ...] [--streams N] [--threads N] [--db-latency MS]
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from urllib.parse import urlsplit
+
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+import app
+from asgi import AsyncApp
+from benchmarks.bench_orders import order_payload, seed
+from benchmarks.common import print_table, use_bench_database
+from db_pool import AsyncConnectionPool
+
+PATHS = ('/api/products', '/api/menus', '/api/orders?limit=20', '/api/customers', '/api/dashboard/stats')
+ORDER_COUNT = 200
+REQUEST_GRACE = 1.0  # seconds a sync request may still take after the case ends
+
+
+class _SlowCursor:
+    """Cursor proxy that waits before every statement."""
+
+    def __init__(self, cursor, latency):
+        self._cursor = cursor
+        self._latency = latency
+
+    def execute(self, *args, **kwargs):
+        time.sleep(self._latency)
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        time.sleep(self._latency)
+        return self._cursor.executemany(*args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _SlowConnection:
+    def __init__(self, connection, latency):
+        self._connection = connection
+        self._latency = latency
+
+    def cursor(self, *args, **kwargs):
+        return _SlowCursor(self._connection.cursor(*args, **kwargs), self._latency)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+class ThreadSampler:
+    """Track the peak number of live threads while a case runs."""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self):
+        while not self._stop.wait(0.02):
+            self.peak = max(self.peak, threading.active_count())
+
+
+def summarize(latencies, errors, duration):
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0
+    return round(len(latencies) / duration, 1), errors, round(p50, 2), round(p95, 2)
+
+
+def run_sync(clients, streams, threads, duration):
+    """Threaded WSGI: every request, and every open stream, holds a worker thread."""
+    server = ThreadPoolExecutor(max_workers=threads)
+    stop = threading.Event()
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+
+    def handle(path):
+        _, status, _ = run_wsgi_app(app.app.wsgi_app, EnvironBuilder(path=path).get_environ(), buffered=True)
+        return status
+
+    def stream():
+        app_iter, _, _ = run_wsgi_app(app.app.wsgi_app, EnvironBuilder(path='/api/orders/stream').get_environ())
+        try:
+            for _ in app_iter:
+                if stop.is_set():
+                    break
+        finally:
+            app_iter.close()
+
+    def client(index, stop_at):
+        n = index
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            future = server.submit(handle, PATHS[n % len(PATHS)])
+            try:
+                status = future.result(timeout=max(stop_at - time.monotonic(), 0) + REQUEST_GRACE)
+            except FutureTimeoutError:
+                # Every worker is busy (e.g. holding a stream), so the request was never served
+                status = 'timeout'
+            elapsed = time.perf_counter() - start
+            n += 1
+            with lock:
+                if status.startswith('200'):
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    with ThreadSampler() as sampler:
+        stream_futures = [server.submit(stream) for _ in range(streams)]
+        stop_at = time.monotonic() + duration
+        workers = [threading.Thread(target=client, args=(i, stop_at)) for i in range(clients)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        stop.set()
+        for future in stream_futures:
+            future.result()
+    server.shutdown(cancel_futures=True)
+    return summarize(latencies, errors[0], duration) + (sampler.peak,)
+
+
+def run_async(clients, streams, duration):
+    """asgi.AsyncApp: requests and streams wait on the event loop; threads match the pool size."""
+    pool = AsyncConnectionPool(app.db_pool)
+    application = AsyncApp(app.app.wsgi_app, pool)
+    latencies, errors = [], [0]
+
+    def scope(path):
+        url = urlsplit(path)
+        return {'type': 'http', 'method': 'GET', 'path': url.path, 'query_string': url.query.encode(),
+                'root_path': '', 'scheme': 'http', 'headers': [], 'server': ('bench', 80),
+                'client': ('127.0.0.1', 0), 'http_version': '1.1'}
+
+    async def request(path):
+        status = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+
+        await application(scope(path), receive, send)
+        return status[0]
+
+    async def stream(stop):
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await stop.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            pass
+
+        await application(scope('/api/orders/stream'), receive, send)
+
+    async def client(index, stop_at):
+        n = index
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            status = await request(PATHS[n % len(PATHS)])
+            elapsed = time.perf_counter() - start
+            n += 1
+            if status == 200:
+                latencies.append(elapsed)
+            else:
+                errors[0] += 1
+
+    async def main():
+        stop = asyncio.Event()
+        stream_tasks = [asyncio.ensure_future(stream(stop)) for _ in range(streams)]
+        stop_at = time.monotonic() + duration
+        await asyncio.gather(*(client(i, stop_at) for i in range(clients)))
+        stop.set()
+        await asyncio.gather(*stream_tasks)
+
+    with ThreadSampler() as sampler:
+        asyncio.run(main())
+    pool.shutdown()
+    return summarize(latencies, errors[0], duration) + (sampler.peak,)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, nargs='+', default=[8, 32, 128], help='concurrent clients')
+    parser.add_argument('--streams', type=int, default=0, help='open order event streams per case')
+    parser.add_argument('--threads', type=int, default=16, help='worker threads in the sync mode')
+    parser.add_argument('--db-latency', type=float, default=1.0, help='milliseconds added to every query')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per case')
+    args = parser.parse_args()
+
+    use_bench_database()
+    client = app.app.test_client()
+    payload = order_payload(seed(), 3)
+    for _ in range(ORDER_COUNT):
+        client.post('/api/orders', json=payload)
+
+    if args.db_latency:
+        connect, latency = app.db_pool._connect, args.db_latency / 1000
+        app.db_pool.close()
+        app.db_pool._connect = lambda: _SlowConnection(connect(), latency)
+    app.ORDER_EVENTS_KEEPALIVE = 0.5  # let sync streams notice the end of a case quickly
+
+    rows = []
+    for clients in args.clients:
+        rows.append((clients, args.streams, f'sync ({args.threads} threads)',
+                     *run_sync(clients, args.streams, args.threads, args.duration)))
+        rows.append((clients, args.streams, f'async (pool {app.db_pool.size})',
+                     *run_async(clients, args.streams, args.duration)))
+
+    print_table(('clients', 'streams', 'mode', 'req/s', 'errors', 'p50 ms', 'p95 ms', 'peak threads'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run against a scratch database (``restaurant_bench`` by default)
+on the server configured in ``app.DB_CONFIG``; they never touch restaurant_db.
+"""
+
+import statistics
+import time
+from contextlib import contextmanager
+
+import app
+
+BENCH_DATABASE = 'restaurant_bench'
+
+
+def use_bench_database(name=BENCH_DATABASE):
+    """Point the app at the scratch database and make sure its schema exists."""
+    app.DB_CONFIG['database'] = name
+    if not app.initialize_database():
+        raise SystemExit(f"Could not initialize benchmark database '{name}'")
+
+
+def reset_tables(cursor):
+    """Empty every application table, children first."""
+    for table in ('order_items', 'orders', 'customers', 'menu_products', 'menus', 'products'):
+        cursor.execute(f"DELETE FROM {table}")
+
+
+class _CountingCursor:
+    """Cursor proxy that counts statements sent to the server."""
+
+    def __init__(self, cursor, counter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def execute(self, *args, **kwargs):
+        self._counter['queries'] += 1
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self._counter['queries'] += 1
+        return self._cursor.executemany(*args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _CountingConnection:
+    """Connection proxy whose cursors count statements."""
+
+    def __init__(self, connection, counter):
+        self._connection = connection
+        self._counter = counter
+
+    def cursor(self, *args, **kwargs):
+        return _CountingCursor(self._connection.cursor(*args, **kwargs), self._counter)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+@contextmanager
+def count_queries():
+    """Count statements executed through app.get_db_connection() inside the block."""
+    counter = {'queries': 0}
+    original = app.get_db_connection
+
+    @contextmanager
+    def counting_connection():
+        with original() as connection:
+            yield _CountingConnection(connection, counter)
+
+    app.get_db_connection = counting_connection
+    try:
+        yield counter
+    finally:
+        app.get_db_connection = original
+
+
+def measure(func, repeat=20, warmup=2):
+    """Call func repeatedly and return latency statistics in milliseconds."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'mean_ms': statistics.mean(samples),
+        'p50_ms': samples[len(samples) // 2],
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+def print_table(headers, rows):
+    """Print rows as a fixed-width table."""
+    widths = [max(len(str(h)), *(len(_fmt(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(_fmt(v).rjust(w) for v, w in zip(row, widths)))
+
+
+def _fmt(value):
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
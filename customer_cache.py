@@ -0,0 +1,73 @@
+"""
+Restaurant Management System - Customer Lookup Cache
+Maps customer emails and phone numbers to customer ids so repeat customers
+can place orders without the customers lookup query.
+
+The cache is filled lazily from database lookups and new inserts, and only
+with committed rows. Customers are never updated or deleted through the API,
+so an entry stays valid once cached. A miss just means asking the database.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def normalize_phone(phone):
+    return (phone or '').strip()
+
+
+class CustomerCache:
+    """Bounded LRU indexes from email and from phone to customer id."""
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._by_email = OrderedDict()
+        self._by_phone = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def lookup(self, email, phone):
+        """Return the cached customer id for an email or phone (email first), or None on a miss."""
+        keys = ((self._by_email, normalize_email(email)), (self._by_phone, normalize_phone(phone)))
+        with self._lock:
+            for index, key in keys:
+                if key and key in index:
+                    index.move_to_end(key)
+                    self._hits += 1
+                    return index[key]
+            self._misses += 1
+            return None
+
+    def remember(self, customer_id, email, phone):
+        """Index a committed customer row under its stored email and phone."""
+        keys = ((self._by_email, normalize_email(email)), (self._by_phone, normalize_phone(phone)))
+        with self._lock:
+            for index, key in keys:
+                if not key:
+                    continue
+                index[key] = customer_id
+                index.move_to_end(key)
+                if len(index) > self.capacity:
+                    index.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._by_email.clear()
+            self._by_phone.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'emails': len(self._by_email),
+                'phones': len(self._by_phone),
+                'capacity': self.capacity,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,262 @@
+"""
+Restaurant Management System - Database Connection Pool
+A small, driver-agnostic connection pool shared by the mariadb and mysql.connector drivers,
+plus an asyncio front end for it used by the ASGI serving mode.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class ConnectionPool:
+    """Bounded pool of database connections with liveness checks and recycling."""
+
+    def __init__(self, connect, size=10, timeout=5.0, validate_after=30.0, max_lifetime=1800.0):
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.validate_after = validate_after
+        self.max_lifetime = max_lifetime
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle = deque()  # (connection, created_at, last_used)
+        self._created_at = {}
+        self._in_use = 0
+        self._total = 0
+
+        # Counters reported through stats()
+        self._connects = 0
+        self._discarded = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._timeouts = 0
+        self._checkouts = 0
+
+    def acquire(self):
+        """Check a connection out of the pool, creating one if there is room."""
+        deadline = None
+        waited_since = None
+
+        with self._lock:
+            while True:
+                if self._idle:
+                    connection, created_at, last_used = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._total < self.size:
+                    connection = None
+                    self._total += 1
+                    self._in_use += 1
+                    break
+
+                # Pool exhausted: wait for a release
+                now = time.monotonic()
+                if waited_since is None:
+                    waited_since = now
+                    deadline = now + self.timeout
+                    self._waits += 1
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._timeouts += 1
+                    self._wait_time += now - waited_since
+                    raise PoolTimeout(
+                        f"No database connection available after {self.timeout}s "
+                        f"(pool size {self.size})"
+                    )
+                self._available.wait(remaining)
+
+            if waited_since is not None:
+                self._wait_time += time.monotonic() - waited_since
+            self._checkouts += 1
+
+        # Connect / validate outside the lock so slow handshakes don't block releases
+        try:
+            if connection is not None:
+                connection = self._revalidate(connection, created_at, last_used)
+            if connection is None:
+                connection = self._open()
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._total -= 1
+                self._available.notify()
+            raise
+        return connection
+
+    def release(self, connection, discard=False):
+        """Return a connection to the pool, or close it if it is no longer usable."""
+        if not discard:
+            try:
+                # End any transaction left open so the next request starts clean
+                connection.rollback()
+            except Exception:
+                discard = True
+
+        created_at = self._created_at.get(id(connection), 0.0)
+        if not discard and self.max_lifetime and time.monotonic() - created_at > self.max_lifetime:
+            discard = True
+
+        if discard:
+            self._close(connection)
+
+        with self._lock:
+            self._in_use -= 1
+            if discard:
+                self._total -= 1
+            else:
+                self._idle.append((connection, created_at, time.monotonic()))
+            self._available.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks a connection out and always returns it."""
+        connection = self.acquire()
+        try:
+            yield connection
+        except BaseException:
+            self.release(connection, discard=not self._is_alive(connection))
+            raise
+        else:
+            self.release(connection)
+
+    def stats(self):
+        """Return a snapshot of pool usage counters."""
+        with self._lock:
+            return {
+                'size': self.size,
+                'open': self._total,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'checkouts': self._checkouts,
+                'connects': self._connects,
+                'discarded': self._discarded,
+                'waits': self._waits,
+                'wait_time_ms': round(self._wait_time * 1000, 3),
+                'timeouts': self._timeouts,
+            }
+
+    def close(self):
+        """Close every idle connection and forget in-use ones."""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total = 0
+            self._in_use = 0
+            self._available.notify_all()
+        for connection, _, _ in idle:
+            self._close(connection)
+
+    def reset(self):
+        """Forget every connection without closing it, in a freshly forked worker.
+
+        The sockets are shared with the parent, so closing them here would end
+        the parent's sessions too.
+        """
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle = deque()
+        self._created_at = {}
+        self._in_use = 0
+        self._total = 0
+
+    # Internal helpers
+    def _open(self):
+        connection = self._connect()
+        with self._lock:
+            self._connects += 1
+            self._created_at[id(connection)] = time.monotonic()
+        return connection
+
+    def _close(self, connection):
+        self._created_at.pop(id(connection), None)
+        with self._lock:
+            self._discarded += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _revalidate(self, connection, created_at, last_used):
+        """Return the connection if still usable, otherwise close it and return None."""
+        now = time.monotonic()
+        if self.max_lifetime and now - created_at > self.max_lifetime:
+            self._close(connection)
+            return None
+        if self.validate_after is not None and now - last_used > self.validate_after:
+            if not self._is_alive(connection):
+                self._close(connection)
+                return None
+        return connection
+
+    @staticmethod
+    def _is_alive(connection):
+        """Ping the server; works for both mariadb and mysql.connector connections."""
+        try:
+            if hasattr(connection, 'is_connected'):
+                return connection.is_connected()
+            connection.ping()
+            return True
+        except Exception:
+            return False
+
+
+class AsyncConnectionPool:
+    """Asyncio front end for a ConnectionPool.
+
+    The MariaDB/MySQL drivers block, so work that needs the database runs on
+    worker threads, one per pooled connection. Coroutines wait for a free slot
+    on the event loop, so open requests cost no thread until they can run.
+    """
+
+    def __init__(self, pool, size=None):
+        self.pool = pool
+        self.size = size or pool.size
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='db')
+        self._slots = None  # asyncio.Semaphore, created on the running loop
+        self._waiting = 0
+        self._running = 0
+        self._runs = 0
+        self._wait_time = 0.0
+
+    async def run(self, func, *args):
+        """Run func(*args) on a database worker thread once a slot is free; return its result."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        started = time.monotonic()
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._wait_time += time.monotonic() - started
+        self._running += 1
+        try:
+            context = contextvars.copy_context()
+            return await asyncio.get_running_loop().run_in_executor(self._executor, context.run, func, *args)
+        finally:
+            self._running -= 1
+            self._runs += 1
+            self._slots.release()
+
+    def stats(self):
+        """Return a snapshot of slot usage counters."""
+        return {
+            'size': self.size,
+            'running': self._running,
+            'waiting': self._waiting,
+            'runs': self._runs,
+            'wait_time_ms': round(self._wait_time * 1000, 3),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
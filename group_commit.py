@@ -0,0 +1,140 @@
+"""
+Restaurant Management System - Group Commit Writer
+A background thread that applies queued writes in small batches, one
+transaction (and one commit/fsync) per batch instead of one per request.
+
+Each queued item runs under its own savepoint, so a failing item is rolled
+back on its own and only its caller sees the error. Callers block until the
+batch holding their item has committed and get back its real result. An item
+that is still queued after the timeout is withdrawn, never written, and its
+caller gets WriterTimeout; once its batch has started the caller waits for it.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+
+class WriterTimeout(Exception):
+    """The item waited in the queue past the timeout and was withdrawn without being written."""
+
+
+class GroupCommitWriter:
+    """Batches writes from many request threads into shared transactions."""
+
+    def __init__(self, connection, apply, max_batch=32, max_wait=0.005, timeout=10.0):
+        self._connection = connection  # context manager factory, e.g. get_db_connection
+        self._apply = apply            # apply(cursor, item) -> result, inside the batch transaction
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        # Counters reported through stats()
+        self._batches = 0
+        self._items = 0
+        self._failed = 0
+        self._largest_batch = 0
+
+    def submit(self, item):
+        """Queue an item and wait for its batch to commit; return apply()'s result or raise its error.
+
+        Raises WriterTimeout if no batch picked the item up within the timeout.
+        """
+        self._ensure_started()
+        future = Future()
+        self._queue.put((item, future))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                raise WriterTimeout(f"Not written: still queued after {self.timeout:g} s") from None
+            return future.result()  # its batch is already running, so it will commit or fail
+
+    def stats(self):
+        with self._lock:
+            return {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'queued': self._queue.qsize(),
+                'batches': self._batches,
+                'items': self._items,
+                'failed': self._failed,
+                'largest_batch': self._largest_batch,
+                'avg_batch': round(self._items / self._batches, 2) if self._batches else 0.0,
+            }
+
+    def shutdown(self, wait=True):
+        """Stop the writer thread after the items already queued."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            if wait:
+                thread.join()
+
+    # Internal helpers
+    def _ensure_started(self):
+        # Started lazily so a process that forks after import gets its own thread
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    self._queue.put(None)  # finish this batch, then stop
+                    break
+                batch.append(entry)
+            self._commit(batch)
+
+    def _commit(self, batch):
+        # Skip items whose callers gave up; the rest can no longer be withdrawn
+        batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        results = []
+        failed = 0
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                for index, (item, future) in enumerate(batch):
+                    cursor.execute(f"SAVEPOINT item_{index}")
+                    try:
+                        results.append((future, self._apply(cursor, item)))
+                    except Exception as e:
+                        cursor.execute(f"ROLLBACK TO SAVEPOINT item_{index}")
+                        future.set_exception(e)
+                        failed += 1
+                conn.commit()
+        except Exception as e:
+            print(f"Group commit of {len(batch)} items failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            failed = len(batch)
+        else:
+            for future, result in results:
+                future.set_result(result)
+
+        with self._lock:
+            self._batches += 1
+            self._items += len(batch)
+            self._failed += failed
+            self._largest_batch = max(self._largest_batch, len(batch))
@@ -0,0 +1,56 @@
+"""
+Restaurant Management System - Production Server
+gunicorn -c gunicorn.conf.py asgi:application
+
+Workers run the asyncio mode (asgi.py) under uvicorn, so open order event
+streams are coroutines and never tie up the threads that serve requests.
+WEB_CONCURRENCY and WEB_THREADS override the CPU-based sizing below.
+The master imports the app once (preload_app) and initializes the database
+before forking, so the workers start from a ready schema and don't race each
+other through initialize_database(). Signals:
+- SIGHUP starts fresh workers and lets the old ones finish their requests.
+- SIGTERM drains in-flight requests for up to graceful_timeout, then exits.
+Open order event streams are closed first so they don't hold up the drain.
+The preloaded code is not re-imported on SIGHUP, so restart the master to
+deploy new code.
+"""
+
+import os
+
+# Server socket and workers: one process per CPU. Order events reach every
+# worker through the order_events table; the top sellers and the caches are
+# per process and pick up other workers' writes within their max_age.
+# UvicornWorker ignores gunicorn's own threads setting: a worker runs database
+# requests on its connection pool's threads, so WEB_THREADS sizes that pool
+# (DB_POOL_SIZE) and a host uses workers x threads database connections.
+cpus = os.cpu_count() or 1
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', cpus))
+threads = int(os.environ.get('WEB_THREADS', min(10, 4 * cpus)))
+os.environ.setdefault('DB_POOL_SIZE', str(threads))
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = True
+
+# Timeouts (seconds)
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+# Logging
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    """Create or migrate the schema once, in the master."""
+    import app
+    import asgi
+    if not app.initialize_database():
+        raise SystemExit(1)
+    asgi.application.initialize_database = False  # workers skip it in their lifespan startup
+
+
+def post_fork(server, worker):
+    """Give each worker its own connection pool; sockets aren't shared across processes."""
+    import app
+    app.db_pool.reset()
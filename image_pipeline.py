@@ -0,0 +1,185 @@
+"""
+Restaurant Management System - Image Upload Pipeline
+Stores uploads under a content-hash name and generates resized and WebP
+variants on a background worker pool.
+
+Pillow is optional: without it uploads are still stored (and deduplicated),
+they are just served without variants.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Pillow format names for the extensions we accept
+PIL_FORMATS = {'jpg': 'JPEG', 'jpeg': 'JPEG', 'png': 'PNG', 'webp': 'WEBP', 'gif': 'GIF'}
+
+
+def variant_name(stem, width, ext):
+    """File name of a resized variant, e.g. 3fa2c0d9e1b47a56.w640.webp."""
+    return f"{stem}.w{width}.{ext}"
+
+
+class ImagePipeline:
+    """Deduplicating upload store with background variant generation."""
+
+    def __init__(self, folder, url_prefix, widths=(320, 640, 1280), workers=2, webp_quality=80,
+                 rescan_interval=60.0, scan_capacity=1024):
+        self.folder = folder
+        self.url_prefix = url_prefix.rstrip('/')
+        self.widths = tuple(sorted(widths))
+        self.webp_quality = webp_quality
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image-variants')
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._variants = {}  # stem -> {(width, ext): file name}
+        self.rescan_interval = rescan_interval
+        self.scan_capacity = scan_capacity
+        self._scanned_at = OrderedDict()  # stem -> time of the last disk scan that found nothing (LRU)
+
+    @property
+    def enabled(self):
+        """Whether variants can be generated (Pillow is installed)."""
+        return Image is not None
+
+    def save(self, file_storage):
+        """Store an uploaded file under its content hash and queue variant generation; return its URL."""
+        data = file_storage.read()
+        ext = file_storage.filename.rsplit('.', 1)[1].lower()
+        stem = hashlib.sha256(data).hexdigest()[:20]
+        filename = f"{stem}.{ext}"
+        path = os.path.join(self.folder, filename)
+
+        # Identical content is stored (and processed) only once
+        if not os.path.exists(path):
+            self._write(path, data)
+        self.submit(filename)
+        return f"{self.url_prefix}/{filename}"
+
+    def submit(self, filename):
+        """Queue variant generation for a stored file unless it is done or in progress."""
+        stem, ext = filename.rsplit('.', 1)
+        if not self.enabled or ext.lower() not in PIL_FORMATS or ext.lower() == 'gif':
+            return None
+        with self._lock:
+            if filename in self._pending or self._variants.get(stem):
+                return None
+        if self._scan(stem, ext):
+            return None  # generated earlier, e.g. before a restart
+        with self._lock:
+            if filename in self._pending:
+                return None
+            self._pending.add(filename)
+        return self._executor.submit(self._generate, filename)
+
+    def best_variant(self, filename, width=None, accept_webp=False):
+        """Return the stored file name that best serves a request for filename.
+
+        Picks the smallest variant at least `width` pixels wide (or the widest
+        one when width is larger than all of them), preferring WebP when the
+        client accepts it. Falls back to the original when no variants exist.
+        """
+        if '.' not in filename:
+            return filename
+        stem, ext = filename.rsplit('.', 1)
+        variants = self._variants.get(stem)
+        if not variants:
+            if not os.path.exists(os.path.join(self.folder, filename)):
+                return filename  # not an upload; don't remember a scan for it
+            variants = self._scan(stem, ext)
+        if not variants:
+            return filename
+
+        formats = ['webp', ext] if accept_webp else [ext]
+        widths = sorted({w for w, _ in variants})
+        chosen = next((w for w in widths if width is not None and w >= width), widths[-1])
+        for fmt in formats:
+            if (chosen, fmt) in variants:
+                return variants[(chosen, fmt)]
+        return filename
+
+    def is_variant(self, filename):
+        """Whether filename is a generated variant rather than an original upload."""
+        parts = filename.rsplit('.', 2)
+        return len(parts) == 3 and parts[1].startswith('w') and parts[1][1:].isdigit()
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    # Internal helpers
+    def _generate(self, filename):
+        stem, ext = filename.rsplit('.', 1)
+        ext = ext.lower()
+        generated = {}
+        try:
+            with Image.open(os.path.join(self.folder, filename)) as original:
+                original.load()
+                for width in self.widths:
+                    # Never upscale: the first width at or above the original keeps its size
+                    resized = original.copy()
+                    resized.thumbnail((min(width, original.width), original.height))
+                    outputs = [('webp', 'WEBP', {'quality': self.webp_quality})]
+                    if ext != 'webp':
+                        outputs.append((ext, PIL_FORMATS[ext], {}))
+                    for out_ext, fmt, options in outputs:
+                        image = resized
+                        if fmt == 'JPEG' and image.mode not in ('RGB', 'L'):
+                            image = image.convert('RGB')
+                        name = variant_name(stem, width, out_ext)
+                        self._write_image(image, os.path.join(self.folder, name), fmt, options)
+                        generated[(width, out_ext)] = name
+                    if width >= original.width:
+                        break
+        except Exception as e:
+            print(f"Image variant generation failed for {filename}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(filename)
+                if generated:
+                    self._variants[stem] = generated
+                    self._scanned_at.pop(stem, None)
+        return generated
+
+    def _scan(self, stem, ext):
+        """Look for variants on disk, e.g. ones generated by another worker process."""
+        scanned_at = self._scanned_at.get(stem)
+        if scanned_at is not None and time.monotonic() - scanned_at < self.rescan_interval:
+            return {}
+        found = {}
+        for width in self.widths:
+            for out_ext in (ext, 'webp'):
+                name = variant_name(stem, width, out_ext)
+                if os.path.exists(os.path.join(self.folder, name)):
+                    found[(width, out_ext)] = name
+        with self._lock:
+            if found:
+                self._variants[stem] = found
+                self._scanned_at.pop(stem, None)
+            else:
+                self._scanned_at[stem] = time.monotonic()
+                self._scanned_at.move_to_end(stem)
+                if len(self._scanned_at) > self.scan_capacity:
+                    self._scanned_at.popitem(last=False)
+        return found
+
+    @staticmethod
+    def _write(path, data):
+        """Write atomically so readers never see a partial file."""
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _write_image(image, path, fmt, options):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        image.save(tmp_path, format=fmt, optimize=True, **options)
+        os.replace(tmp_path, path)
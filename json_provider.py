@@ -0,0 +1,50 @@
+"""
+Restaurant Management System - JSON Provider
+Encodes database rows (Decimal, datetime, date) in a single pass, using orjson when it is installed.
+The decoded JSON is the same either way, but the bytes are not: the stdlib
+path escapes non-ASCII text ("Caf\\u00e9") while orjson writes raw UTF-8.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_value(obj):
+    """Fallback encoder for the database types the standard encoder can't handle."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+
+class RowJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes raw database rows directly."""
+
+    default = staticmethod(encode_value)
+
+    def dumps(self, obj, **kwargs):
+        # Flask passes compact separators itself; anything else needs the stdlib encoder
+        if orjson is not None and kwargs in ({}, {'separators': (',', ':')}):
+            return self._orjson_dumps(obj).decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if orjson is None or (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        # Hand orjson's bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._orjson_dumps(obj) + b'\n', mimetype=self.mimetype)
+
+    def _orjson_dumps(self, obj):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=encode_value, option=option)
@@ -0,0 +1,289 @@
+"""
+Restaurant Management System - Request Metrics
+Times each request's database queries, connection waits and JSON
+serialization, aggregates them per route and renders everything in the
+Prometheus text exposition format.
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SLOW_LOG_QUERIES = 5     # slowest statements printed per slow request
+SLOW_LOG_SQL_CHARS = 300
+MAX_TRACKED_QUERIES = 200  # statements remembered per request for the slow log
+NO_ROUTE = 'none'        # label for work done outside a request (CLI, streamed bodies)
+
+_current = ContextVar('request_stats', default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestStats:
+    """What one request spent its time on."""
+
+    def __init__(self, method, route):
+        self.method = method
+        self.route = route
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.connection_wait = 0.0
+        self.serialize_time = 0.0
+        self.queries = []  # [sql, seconds]
+        self._serializing = 0
+
+
+class RequestMetrics:
+    """Per-route request, query and serialization metrics for one process."""
+
+    def __init__(self, slow_threshold=0.5, prefix='restaurant', log=print):
+        self.slow_threshold = slow_threshold
+        self.prefix = prefix
+        self.log = log
+        self._lock = threading.Lock()
+        self._counters = {}    # name -> {labels: value}
+        self._histograms = {}  # name -> {labels: Histogram}
+        self._help = {}
+
+    # Request lifecycle
+    def begin(self, method, route):
+        """Start collecting for the current request (thread or task)."""
+        stats = RequestStats(method, route)
+        _current.set(stats)
+        return stats
+
+    def finish(self, status):
+        """Record the current request and log it if it was slow."""
+        stats = _current.get()
+        if stats is None:
+            return None
+        _current.set(None)
+        elapsed = time.perf_counter() - stats.started
+        route = (stats.method, stats.route)
+        with self._lock:
+            self._inc('http_requests_total', route + (str(status),))
+            self._observe('http_request_duration_seconds', route, elapsed, LATENCY_BUCKETS)
+            self._observe('db_queries_per_request', route, stats.query_count, QUERY_COUNT_BUCKETS)
+            self._observe('db_time_per_request_seconds', route, stats.db_time, LATENCY_BUCKETS)
+            self._observe('serialization_seconds', route, stats.serialize_time, LATENCY_BUCKETS)
+            if elapsed >= self.slow_threshold:
+                self._inc('slow_requests_total', route)
+        if elapsed >= self.slow_threshold:
+            self._log_slow(stats, status, elapsed)
+        return elapsed
+
+    # Hooks called from the database and JSON layers
+    def record_query(self, sql, seconds):
+        stats = _current.get()
+        route = stats.route if stats is not None else NO_ROUTE
+        if stats is not None:
+            stats.query_count += 1
+            stats.db_time += seconds
+            if len(stats.queries) < MAX_TRACKED_QUERIES:
+                stats.queries.append([sql, seconds])
+        with self._lock:
+            self._observe('db_query_duration_seconds', (route,), seconds, LATENCY_BUCKETS)
+
+    def record_fetch(self, seconds):
+        """Add row-fetch time to the request and to the statement that produced the rows."""
+        stats = _current.get()
+        if stats is None:
+            return
+        stats.db_time += seconds
+        if stats.queries:
+            stats.queries[-1][1] += seconds
+
+    def record_connection_wait(self, seconds):
+        stats = _current.get()
+        if stats is not None:
+            stats.connection_wait += seconds
+        with self._lock:
+            self._observe('db_connection_wait_seconds', (), seconds, LATENCY_BUCKETS)
+
+    @contextmanager
+    def serializing(self):
+        """Time JSON encoding; nested encodes (response() calling dumps()) count once."""
+        stats = _current.get()
+        if stats is None or stats._serializing:
+            yield
+            return
+        stats._serializing += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats._serializing -= 1
+            stats.serialize_time += time.perf_counter() - start
+
+    def instrument(self, connection):
+        """Wrap a driver connection so its cursors report to these metrics."""
+        return InstrumentedConnection(connection, self)
+
+    # Exposition
+    def render(self, gauges=None, counters=None):
+        """Render all metrics as Prometheus text.
+
+        gauges are point-in-time values and counters are running totals kept
+        elsewhere (pool, caches), both as {name: (help, value)}.
+        """
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# HELP {self.prefix}_{name} {self._help[name]}")
+                lines.append(f"# TYPE {self.prefix}_{name} counter")
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append(f"{self.prefix}_{name}{_labels(name, labels)} {value}")
+            for name in sorted(self._histograms):
+                lines.append(f"# HELP {self.prefix}_{name} {self._help[name]}")
+                lines.append(f"# TYPE {self.prefix}_{name} histogram")
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                        cumulative += count
+                        le = bound if bound == '+Inf' else _number(bound)
+                        lines.append(f"{self.prefix}_{name}_bucket{_labels(name, labels, le=le)} {cumulative}")
+                    lines.append(f"{self.prefix}_{name}_sum{_labels(name, labels)} {_number(histogram.sum)}")
+                    lines.append(f"{self.prefix}_{name}_count{_labels(name, labels)} {histogram.count}")
+        for kind, values in (('counter', counters), ('gauge', gauges)):
+            for name, (help_text, value) in sorted((values or {}).items()):
+                lines.append(f"# HELP {self.prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {self.prefix}_{name} {kind}")
+                lines.append(f"{self.prefix}_{name} {_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+    # Internal helpers (callers hold self._lock)
+    def _inc(self, name, labels):
+        self._help.setdefault(name, HELP[name])
+        series = self._counters.setdefault(name, {})
+        series[labels] = series.get(labels, 0) + 1
+
+    def _observe(self, name, labels, value, buckets):
+        self._help.setdefault(name, HELP[name])
+        series = self._histograms.setdefault(name, {})
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = Histogram(buckets)
+        histogram.observe(value)
+
+    def _log_slow(self, stats, status, elapsed):
+        self.log(f"🐢 Slow request: {stats.method} {stats.route} -> {status} in {elapsed * 1000:.1f} ms "
+                 f"(db {stats.db_time * 1000:.1f} ms over {stats.query_count} queries, "
+                 f"connection wait {stats.connection_wait * 1000:.1f} ms, "
+                 f"serialization {stats.serialize_time * 1000:.1f} ms)")
+        slowest = sorted(stats.queries, key=lambda query: query[1], reverse=True)[:SLOW_LOG_QUERIES]
+        for sql, seconds in slowest:
+            sql = re.sub(r'\s+', ' ', sql).strip()
+            if len(sql) > SLOW_LOG_SQL_CHARS:
+                sql = sql[:SLOW_LOG_SQL_CHARS] + '...'
+            self.log(f"    {seconds * 1000:8.1f} ms  {sql}")
+
+
+class InstrumentedConnection:
+    """Driver connection proxy whose cursors time every statement."""
+
+    def __init__(self, connection, metrics):
+        self._connection = connection
+        self._metrics = metrics
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._metrics)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+class InstrumentedCursor:
+    """Cursor proxy reporting execute and fetch time to RequestMetrics."""
+
+    def __init__(self, cursor, metrics):
+        self._cursor = cursor
+        self._metrics = metrics
+
+    def execute(self, sql, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(sql, *args, **kwargs)
+        finally:
+            self._metrics.record_query(sql, time.perf_counter() - start)
+
+    def executemany(self, sql, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql, *args, **kwargs)
+        finally:
+            self._metrics.record_query(sql, time.perf_counter() - start)
+
+    def fetchone(self):
+        return self._timed_fetch(self._cursor.fetchone)
+
+    def fetchall(self):
+        return self._timed_fetch(self._cursor.fetchall)
+
+    def fetchmany(self, *args, **kwargs):
+        return self._timed_fetch(self._cursor.fetchmany, *args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _timed_fetch(self, fetch, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fetch(*args, **kwargs)
+        finally:
+            self._metrics.record_fetch(time.perf_counter() - start)
+
+
+HELP = {
+    'http_requests_total': 'Requests handled, by method, route and status.',
+    'http_request_duration_seconds': 'Request latency from routing to the last body byte.',
+    'db_queries_per_request': 'Database statements executed per request.',
+    'db_time_per_request_seconds': 'Time per request spent executing statements and fetching rows.',
+    'db_query_duration_seconds': 'Execution time of individual database statements, by route.',
+    'db_connection_wait_seconds': 'Time spent checking a connection out of the pool.',
+    'serialization_seconds': 'Time per request spent encoding JSON.',
+    'slow_requests_total': 'Requests slower than the slow-request threshold.',
+}
+
+LABEL_NAMES = {
+    'http_requests_total': ('method', 'route', 'status'),
+    'db_query_duration_seconds': ('route',),
+    'db_connection_wait_seconds': (),
+}
+
+
+def _labels(name, values, **extra):
+    names = LABEL_NAMES.get(name, ('method', 'route'))
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(str(value))}"' for key, value in pairs) + '}'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
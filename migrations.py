@@ -0,0 +1,230 @@
+"""
+Restaurant Management System - Schema Migrations
+Ordered, idempotent schema and data changes tracked in the schema_migrations table.
+
+Each migration is a list of operations; every operation checks whether its
+change is already present, so re-running a half-applied migration is safe.
+"""
+
+from collections import namedtuple
+
+Migration = namedtuple('Migration', ['version', 'description', 'operations'])
+
+
+class CreateTable:
+    """Create a table unless a table with that name already exists."""
+
+    def __init__(self, name, definition):
+        self.name = name
+        self.definition = definition
+
+    def apply(self, cursor):
+        if table_exists(cursor, self.name):
+            return False
+        cursor.execute(f"CREATE TABLE {self.name} ({self.definition})")
+        return True
+
+    def __str__(self):
+        return f"table {self.name}"
+
+
+class CreateIndex:
+    """Create a secondary index unless an index with that name already exists."""
+
+    def __init__(self, table, name, columns):
+        self.table = table
+        self.name = name
+        self.columns = columns
+
+    def apply(self, cursor):
+        if index_exists(cursor, self.table, self.name):
+            return False
+        cursor.execute(f"CREATE INDEX {self.name} ON {self.table} ({', '.join(self.columns)})")
+        return True
+
+    def __str__(self):
+        return f"index {self.name} on {self.table}({', '.join(self.columns)})"
+
+
+class RunSQL:
+    """Run data statements that give the same result when run again."""
+
+    def __init__(self, description, statements):
+        self.description = description
+        self.statements = statements
+
+    def apply(self, cursor):
+        for statement in self.statements:
+            cursor.execute(statement)
+        return True
+
+    def __str__(self):
+        return self.description
+
+
+MIGRATIONS = [
+    Migration(1, 'Index customers by email and phone for order placement lookups', [
+        CreateIndex('customers', 'idx_customers_email', ['email']),
+        CreateIndex('customers', 'idx_customers_phone', ['phone']),
+    ]),
+    Migration(2, 'Index orders for date-sorted, status-filtered listings', [
+        CreateIndex('orders', 'idx_orders_order_date', ['order_date', 'id']),
+        CreateIndex('orders', 'idx_orders_status_order_date', ['status', 'order_date']),
+    ]),
+    Migration(3, 'Index customers and products by creation time', [
+        CreateIndex('customers', 'idx_customers_created_at', ['created_at']),
+        CreateIndex('products', 'idx_products_created_at', ['created_at']),
+    ]),
+    Migration(4, 'Add the order archive tables, indexed for date-sorted listings', [
+        CreateTable('orders_archive', """
+            id INT PRIMARY KEY,
+            customer_id INT,
+            total_amount DECIMAL(10,2) NOT NULL,
+            status ENUM('pending', 'preparing', 'completed', 'cancelled') NOT NULL,
+            order_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (customer_id) REFERENCES customers(id)
+        """),
+        CreateTable('order_items_archive', """
+            id INT NOT NULL,
+            order_id INT NOT NULL,
+            product_id INT,
+            quantity INT NOT NULL,
+            price DECIMAL(10,2) NOT NULL,
+            PRIMARY KEY (order_id, id),
+            FOREIGN KEY (order_id) REFERENCES orders_archive(id) ON DELETE CASCADE,
+            FOREIGN KEY (product_id) REFERENCES products(id)
+        """),
+        CreateIndex('orders_archive', 'idx_orders_archive_order_date', ['order_date', 'id']),
+    ]),
+    Migration(5, 'Leave cancelled orders out of product_sales', [
+        CreateTable('product_sales', """
+            product_id INT PRIMARY KEY,
+            total_sold INT NOT NULL DEFAULT 0,
+            revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+            FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE CASCADE
+        """),
+        RunSQL('recount product_sales', [
+            "DELETE FROM product_sales",
+            """
+            INSERT INTO product_sales (product_id, total_sold, revenue)
+            SELECT oi.product_id, SUM(oi.quantity), SUM(oi.quantity * oi.price)
+            FROM (SELECT order_id, product_id, quantity, price FROM order_items
+                  UNION ALL SELECT order_id, product_id, quantity, price FROM order_items_archive) oi
+            JOIN (SELECT id, status FROM orders UNION ALL SELECT id, status FROM orders_archive) o
+              ON o.id = oi.order_id
+            WHERE o.status <> 'cancelled'
+            GROUP BY oi.product_id
+            """,
+        ]),
+    ]),
+    Migration(6, 'Add the dashboard counters table', [
+        CreateTable('dashboard_counters', """
+            name VARCHAR(50) PRIMARY KEY,
+            value DECIMAL(14,2) NOT NULL DEFAULT 0
+        """),
+    ]),
+    Migration(7, 'Add the hourly sales rollup tables', [
+        CreateTable('sales_hourly', """
+            hour_start DATETIME NOT NULL,
+            status ENUM('pending', 'preparing', 'completed', 'cancelled') NOT NULL,
+            order_count INT NOT NULL DEFAULT 0,
+            units INT NOT NULL DEFAULT 0,
+            revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (hour_start, status)
+        """),
+        CreateTable('product_sales_hourly', """
+            hour_start DATETIME NOT NULL,
+            product_id INT NOT NULL,
+            status ENUM('pending', 'preparing', 'completed', 'cancelled') NOT NULL,
+            order_count INT NOT NULL DEFAULT 0,
+            units INT NOT NULL DEFAULT 0,
+            revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (product_id, hour_start, status)
+        """),
+    ]),
+    Migration(8, 'Add the order event log shared by worker processes', [
+        CreateTable('order_events', """
+            id INT PRIMARY KEY,
+            event_type VARCHAR(50) NOT NULL,
+            data TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        """),
+        CreateTable('order_event_sequence', """
+            id INT PRIMARY KEY,
+            last_event_id INT NOT NULL DEFAULT 0
+        """),
+        RunSQL('seed order_event_sequence', [
+            "INSERT IGNORE INTO order_event_sequence (id, last_event_id) VALUES (1, 0)",
+        ]),
+    ]),
+]
+
+
+def table_exists(cursor, name):
+    """Check information_schema for a table in the current database."""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = %s
+    """, (name,))
+    return cursor.fetchone()[0] > 0
+
+
+def index_exists(cursor, table, name):
+    """Check information_schema for an index on a table in the current database."""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (table, name))
+    return cursor.fetchone()[0] > 0
+
+
+def ensure_migrations_table(cursor):
+    """Create the schema version table if it doesn't exist yet."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied_versions(cursor):
+    """Return {version: applied_at} for every recorded migration."""
+    ensure_migrations_table(cursor)
+    cursor.execute("SELECT version, applied_at FROM schema_migrations")
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def apply_migrations(conn, migrations=MIGRATIONS):
+    """Apply pending migrations in version order; return the versions applied."""
+    cursor = conn.cursor()
+    applied = applied_versions(cursor)
+    newly_applied = []
+
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version in applied:
+            continue
+        print(f"🔧 Applying migration {migration.version}: {migration.description}")
+        for operation in migration.operations:
+            if not operation.apply(cursor):
+                print(f"   - {operation} already present")
+        cursor.execute(
+            "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+            (migration.version, migration.description)
+        )
+        conn.commit()
+        newly_applied.append(migration.version)
+
+    cursor.close()
+    return newly_applied
+
+
+def migration_status(conn, migrations=MIGRATIONS):
+    """Return (version, description, applied_at or None) for every known migration."""
+    cursor = conn.cursor()
+    applied = applied_versions(cursor)
+    cursor.close()
+    return [(m.version, m.description, applied.get(m.version))
+            for m in sorted(migrations, key=lambda m: m.version)]
@@ -0,0 +1,251 @@
+"""
+Restaurant Management System - Order Events
+In-process publish/subscribe for order changes with a bounded replay buffer,
+used by the /api/orders/stream Server-Sent Events endpoint. The threaded
+(app.py) and asyncio (asgi.py) versions of that endpoint share the response
+headers and the event-to-text encoding below.
+
+With several worker processes, the write routes append events to a shared
+log (the order_events table) instead, and each process's EventRelay copies
+new log entries into its own broker. Event ids are then the same in every
+process, so a client can resume on any worker.
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+from collections import deque
+
+SSE_HEADERS = {
+    'Content-Type': 'text/event-stream; charset=utf-8',
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no',  # don't let a proxy buffer the stream
+}
+SSE_PREAMBLE = "retry: 3000\n\n"  # reconnect delay for EventSource clients, in ms
+SSE_KEEPALIVE = ": keep-alive\n\n"
+
+
+class EventBroker:
+    """Numbered event log that subscribers block on and resume from by id."""
+
+    def __init__(self, replay_size=1000, encode=json.dumps):
+        self._encode = encode
+        self._events = deque(maxlen=replay_size)  # (id, type, data_json)
+        self._condition = threading.Condition()
+        self._last_id = 0
+        self._subscribers = 0
+        self._published = 0
+        self._listeners = []  # callbacks for waiters that can't block on the condition
+        self.closed = False
+
+    def publish(self, event_type, data):
+        """Append an event and wake every waiting subscriber; return its id."""
+        payload = self._encode(data)
+        with self._condition:
+            self._last_id += 1
+            self._events.append((self._last_id, event_type, payload))
+            self._published += 1
+            self._condition.notify_all()
+            event_id = self._last_id
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+        return event_id
+
+    def append(self, event_id, event_type, payload):
+        """Add an already-encoded event that has its own id (from a shared log).
+
+        Ids must increase; an id at or below the last one is ignored, so
+        overlapping reads of the log are harmless. Returns whether it was added.
+        """
+        with self._condition:
+            if event_id <= self._last_id:
+                return False
+            self._last_id = event_id
+            self._events.append((event_id, event_type, payload))
+            self._published += 1
+            self._condition.notify_all()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+        return True
+
+    def last_id(self):
+        with self._condition:
+            return self._last_id
+
+    def events_after(self, last_id, timeout=None):
+        """Return (events, position, reset) for events newer than last_id.
+
+        Waits up to timeout seconds when there is nothing new. position is the
+        id to resume from next time. reset is True when last_id can't be
+        resumed from (it fell out of the replay buffer or predates a restart);
+        the subscriber should then reload its state and carry on from position.
+        """
+        with self._condition:
+            if last_id is None:
+                last_id = self._last_id
+            if last_id == self._last_id and timeout:
+                self._condition.wait_for(lambda: self._last_id != last_id or self.closed, timeout)
+
+            oldest = self._events[0][0] if self._events else self._last_id + 1
+            if last_id > self._last_id or last_id < oldest - 1:
+                return [], self._last_id, True
+            events = [event for event in self._events if event[0] > last_id]
+            return events, self._last_id, False
+
+    def close(self):
+        """Wake every subscriber so open streams end (the process is shutting down)."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+
+    def add_listener(self, callback):
+        """Call callback() from the publishing thread after every event (used by asyncio streams)."""
+        with self._condition:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._condition:
+            self._listeners.remove(callback)
+
+    def subscribe(self):
+        """Count an open stream; pair with unsubscribe()."""
+        with self._condition:
+            self._subscribers += 1
+
+    def unsubscribe(self):
+        with self._condition:
+            self._subscribers -= 1
+
+    def stats(self):
+        with self._condition:
+            return {
+                'last_event_id': self._last_id,
+                'buffered': len(self._events),
+                'published': self._published,
+                'subscribers': self._subscribers,
+            }
+
+
+class EventRelay:
+    """Copies events from a shared log into a broker, for one worker process.
+
+    read_events(after_id) returns (id, type, data_json) rows in id order: the
+    rows after after_id, or the newest replay-size rows when after_id is None.
+    trim_events(through_id) deletes the rows up to through_id. Writers call
+    notify() after committing an event. That bumps a change counter in shared
+    memory, which the relay thread of every process forked from this one
+    checks every poll_interval seconds, so the log is only read after a
+    change and idle streams never touch the database.
+
+    The relay thread starts with the first stream in a process. Create the
+    relay before the server forks its workers (gunicorn preload_app).
+    """
+
+    def __init__(self, broker, read_events, trim_events=None, poll_interval=0.1, keep=1000):
+        self.broker = broker
+        self.poll_interval = poll_interval
+        self.keep = keep  # rows left in the log when it is trimmed
+        self._read_events = read_events
+        self._trim_events = trim_events
+        self._changes = multiprocessing.Value('Q', 0)  # shared by forked workers
+        self._pid = None
+        self._reset()
+
+    def _reset(self):
+        """Fresh thread state, e.g. in a forked worker; locks and threads don't survive fork."""
+        self._pid = os.getpid()
+        self._lock = threading.Lock()  # one log read at a time
+        self._wake = threading.Event()
+        self._thread = None
+        self._loaded = False
+        self._seen = self._changes.value
+        self._trimmed_through = 0
+        self._reads = 0
+
+    def start(self):
+        """Load the recent log into the broker and start the relay thread, once per process."""
+        if self._pid != os.getpid():
+            self._reset()
+        if self._thread is not None:
+            return
+        self.sync()  # raises if the log can't be read; the next stream tries again
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='order-event-relay', daemon=True)
+                self._thread.start()
+
+    def catch_up(self, position):
+        """Start the relay and read the log now if position is ahead of this process's broker.
+
+        A client resuming on another worker may know of events this relay
+        hasn't copied yet.
+        """
+        self.start()
+        if position is not None and position > self.broker.last_id():
+            self.sync()
+
+    def notify(self):
+        """Tell every process that the log changed (call after the commit)."""
+        with self._changes.get_lock():
+            self._changes.value += 1
+        self._wake.set()
+
+    def sync(self):
+        """Copy new log rows into the broker; return the number added."""
+        with self._lock:
+            self._seen = self._changes.value
+            after_id = self.broker.last_id() if self._loaded else None
+            rows = self._read_events(after_id)
+            self._loaded = True
+            self._reads += 1
+            added = sum(self.broker.append(event_id, event_type, payload) for event_id, event_type, payload in rows)
+            last_id = self.broker.last_id()
+            if self._trim_events is not None and last_id - self._trimmed_through > 2 * self.keep:
+                self._trim_events(last_id - self.keep)
+                self._trimmed_through = last_id - self.keep
+        return added
+
+    def stats(self):
+        return {
+            'relay_running': self._thread is not None and self._thread.is_alive(),
+            'relay_reads': self._reads,
+        }
+
+    def _run(self):
+        while not self.broker.closed:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if self.broker.closed:
+                return
+            if self._changes.value != self._seen:
+                try:
+                    # A batch can be longer than one read, so keep going until it is drained
+                    while self.sync():
+                        pass
+                except Exception as e:
+                    self._seen = None  # try again on the next poll
+                    print(f"Order event relay failed to read the log: {e}")
+
+
+def format_sse(event_id, event_type, data):
+    """Format one event in the text/event-stream wire format."""
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+def read_sse(broker, position, timeout=None):
+    """Return (text, position) for the events after position, in wire format.
+
+    Waits up to timeout seconds for an event (None returns at once). text is
+    '' when nothing arrived, so the caller can send SSE_KEEPALIVE instead; a
+    'reset' event leads when position can't be resumed from.
+    """
+    events, position, reset = broker.events_after(position, timeout=timeout)
+    chunks = [format_sse(position, 'reset', '{}')] if reset else []
+    chunks += [format_sse(*event) for event in events]
+    return ''.join(chunks), position
@@ -0,0 +1,207 @@
+"""
+Restaurant Management System - Product Search Index
+In-memory index of the products table: word prefixes of name and
+description, category -> product ids, and products sorted by price, so
+searches and category lists never scan the table.
+
+The product routes update the index after they commit. Like the catalog
+cache, each process holds its own copy and reloads it once it is older than
+max_age, which also picks up writes made by other worker processes.
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+
+WORD = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Lowercase words of a name, description or query."""
+    return WORD.findall((text or '').lower())
+
+
+def category_key(category):
+    return (category or '').strip().lower()
+
+
+class ProductIndex:
+    """Token, category and price indexes over product rows (dicts keyed by column)."""
+
+    def __init__(self, max_age=30.0):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._products = {}     # product_id -> row
+        self._words = {}        # word -> {product_id}
+        self._vocabulary = []   # sorted words, for prefix lookups
+        self._categories = {}   # category key -> {product_id}
+        self._category_names = {}  # category key -> name as stored
+        self._prices = []       # sorted (price, product_id)
+        self._version = 0       # bumped by every write, see load()
+        self._loaded_at = None
+        self._searches = 0
+        self._loads = 0
+
+    @property
+    def version(self):
+        return self._version
+
+    def needs_load(self):
+        """Whether the index has never been loaded, was invalidated or is older than max_age."""
+        loaded_at = self._loaded_at
+        return loaded_at is None or (self.max_age is not None and time.monotonic() - loaded_at > self.max_age)
+
+    def load(self, rows, version):
+        """Replace the index with rows read after version was taken.
+
+        If a write landed while the rows were being read they may miss it, so the
+        index is kept but left due for another load.
+        """
+        with self._lock:
+            self._products = {}
+            self._words = {}
+            self._vocabulary = []
+            self._categories = {}
+            self._category_names = {}
+            self._prices = []
+            for row in rows:
+                self._insert(row, sort=False)
+            self._vocabulary = sorted(self._words)
+            self._prices.sort()
+            self._loaded_at = time.monotonic() if version == self._version else None
+            self._loads += 1
+
+    def upsert(self, row):
+        """Add a committed product row, replacing any previous version of it."""
+        with self._lock:
+            self._version += 1
+            if self._loaded_at is None:
+                return  # the next load reads it from the database
+            self._remove(row['id'])
+            self._insert(row)
+
+    def remove(self, product_id):
+        with self._lock:
+            self._version += 1
+            if self._loaded_at is not None:
+                self._remove(product_id)
+
+    def invalidate(self):
+        """Drop the index after writes it can't follow row by row (bulk imports)."""
+        with self._lock:
+            self._version += 1
+            self._loaded_at = None
+
+    def search(self, query='', category=None, min_price=None, max_price=None, limit=50):
+        """Return (total, rows) of products matching every filter.
+
+        Every query word must prefix a word of the name or description. Products
+        whose name matches the query come first, then by name.
+        """
+        words = tokenize(query)
+        with self._lock:
+            self._searches += 1
+            candidates = []
+            for word in words:
+                candidates.append(self._prefix_matches(word))
+            if category:
+                candidates.append(self._categories.get(category_key(category), set()))
+            if min_price is not None or max_price is not None:
+                if not candidates:
+                    candidates.append(self._price_range(min_price, max_price))
+                else:
+                    low = float('-inf') if min_price is None else min_price
+                    high = float('inf') if max_price is None else max_price
+                    candidates.append({product_id for product_id in min(candidates, key=len)
+                                       if low <= float(self._products[product_id]['price']) <= high})
+
+            if candidates:
+                candidates.sort(key=len)
+                matches = set(candidates[0]).intersection(*candidates[1:])
+            else:
+                matches = self._products.keys()
+            rows = [self._products[product_id] for product_id in matches]
+
+        rows.sort(key=lambda row: (self._rank(row, words), (row['name'] or '').lower(), row['id']))
+        return len(rows), rows[:limit]
+
+    def categories(self):
+        """Return {category name: product count} for categories that have products."""
+        with self._lock:
+            return {self._category_names[key]: len(ids) for key, ids in self._categories.items()}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'loaded': self._loaded_at is not None,
+                'age_seconds': round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+                'products': len(self._products),
+                'words': len(self._vocabulary),
+                'categories': len(self._categories),
+                'searches': self._searches,
+                'loads': self._loads,
+            }
+
+    # Internal helpers (callers hold self._lock)
+    def _insert(self, row, sort=True):
+        product_id = row['id']
+        self._products[product_id] = row
+        for word in set(tokenize(row.get('name')) + tokenize(row.get('description'))):
+            ids = self._words.get(word)
+            if ids is None:
+                ids = self._words[word] = set()
+                if sort:
+                    insort(self._vocabulary, word)
+            ids.add(product_id)
+        key = category_key(row.get('category'))
+        if key:
+            self._categories.setdefault(key, set()).add(product_id)
+            self._category_names[key] = row['category'].strip()
+        entry = (float(row['price'] or 0), product_id)
+        if sort:
+            insort(self._prices, entry)
+        else:
+            self._prices.append(entry)
+
+    def _remove(self, product_id):
+        row = self._products.pop(product_id, None)
+        if row is None:
+            return
+        for word in set(tokenize(row.get('name')) + tokenize(row.get('description'))):
+            ids = self._words[word]
+            ids.discard(product_id)
+            if not ids:
+                del self._words[word]
+                del self._vocabulary[bisect_left(self._vocabulary, word)]
+        key = category_key(row.get('category'))
+        if key:
+            ids = self._categories[key]
+            ids.discard(product_id)
+            if not ids:
+                del self._categories[key]
+                del self._category_names[key]
+        del self._prices[bisect_left(self._prices, (float(row['price'] or 0), product_id))]
+
+    def _prefix_matches(self, prefix):
+        matches = set()
+        for i in range(bisect_left(self._vocabulary, prefix), len(self._vocabulary)):
+            word = self._vocabulary[i]
+            if not word.startswith(prefix):
+                break
+            matches |= self._words[word]
+        return matches
+
+    def _price_range(self, min_price, max_price):
+        start = 0 if min_price is None else bisect_left(self._prices, (min_price,))
+        end = len(self._prices) if max_price is None else bisect_right(self._prices, (max_price, float('inf')))
+        return {product_id for _, product_id in self._prices[start:end]}
+
+    @staticmethod
+    def _rank(row, words):
+        if not words:
+            return 0
+        name_words = tokenize(row.get('name'))
+        if all(any(name_word.startswith(word) for name_word in name_words) for word in words):
+            return 0
+        return 1
@@ -0,0 +1,99 @@
+"""
+Restaurant Management System - Product Import/Export Formats
+Reads product records from CSV, NDJSON or JSON array files one row at a
+time, and writes product rows back out as CSV.
+
+Records are plain dicts keyed by column name. The keys used in products.json
+(title, img) are accepted as aliases for name and image_url.
+"""
+
+import csv
+import io
+import json
+
+IMPORT_FORMATS = ('csv', 'ndjson', 'json')
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_COLUMNS = ('id', 'name', 'category', 'description', 'price', 'image_url', 'created_at')
+
+FIELD_ALIASES = {'title': 'name', 'img': 'image_url', 'image': 'image_url'}
+
+FORMAT_BY_EXTENSION = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.json': 'json'}
+FORMAT_BY_MIMETYPE = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'application/json': 'json',
+}
+
+
+def detect_format(filename=None, mimetype=None):
+    """Guess the import format from a file extension or content type; None if unknown."""
+    if filename:
+        for extension, fmt in FORMAT_BY_EXTENSION.items():
+            if filename.lower().endswith(extension):
+                return fmt
+    return FORMAT_BY_MIMETYPE.get((mimetype or '').split(';')[0].strip().lower())
+
+
+def normalize_record(record):
+    """Lowercase keys and map aliases onto product column names."""
+    normalized = {}
+    for key, value in record.items():
+        if key is None:
+            continue  # extra CSV cells without a header
+        key = key.strip().lower()
+        normalized[FIELD_ALIASES.get(key, key)] = value
+    return normalized
+
+
+def read_records(stream, fmt):
+    """Yield (row_number, record or ValueError) from a binary stream.
+
+    Rows are numbered from 1 (for CSV, the first line after the header). A
+    row that can't be parsed yields a ValueError instead of stopping the read.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='' if fmt == 'csv' else None)
+    if fmt == 'csv':
+        for number, record in enumerate(csv.DictReader(text), start=1):
+            yield number, normalize_record(record)
+    elif fmt == 'ndjson':
+        number = 0
+        for line in text:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield number, ValueError(f"Invalid JSON: {e}")
+                continue
+            yield number, normalize_record(record) if isinstance(record, dict) else ValueError('Expected a JSON object')
+    elif fmt == 'json':
+        # A JSON array such as products.json has to be parsed whole
+        try:
+            records = json.load(text)
+        except ValueError as e:
+            yield 1, ValueError(f"Invalid JSON: {e}")
+            return
+        if not isinstance(records, list):
+            yield 1, ValueError('Expected a JSON array of objects')
+            return
+        for number, record in enumerate(records, start=1):
+            yield number, normalize_record(record) if isinstance(record, dict) else ValueError('Expected a JSON object')
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def iter_csv(batches, columns=EXPORT_COLUMNS):
+    """Encode batches of row dicts as CSV text chunks, header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        for row in rows:
+            writer.writerow(['' if row.get(column) is None else row.get(column) for column in columns])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
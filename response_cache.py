@@ -0,0 +1,65 @@
+"""
+Restaurant Management System - Response Cache
+Holds a pre-serialized response body with a content-hash ETag until it is invalidated.
+"""
+
+import hashlib
+import threading
+import time
+
+
+class CachedBody:
+    """Lazily built response body that write routes invalidate."""
+
+    def __init__(self, build, max_age=30.0):
+        # build() returns the serialized body as bytes
+        self._build = build
+        self.max_age = max_age
+        self._lock = threading.Lock()        # serializes rebuilds
+        self._state_lock = threading.Lock()  # guards version/entry swaps
+        self._entry = None  # (body, etag, built_at)
+        self._version = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self):
+        """Return (body, etag), rebuilding the body if it was invalidated or expired."""
+        entry = self._entry
+        if entry is not None and not self._expired(entry):
+            self._hits += 1
+            return entry[0], entry[1]
+
+        with self._lock:
+            # Another thread may have rebuilt it while we waited
+            entry = self._entry
+            if entry is not None and not self._expired(entry):
+                self._hits += 1
+                return entry[0], entry[1]
+
+            self._misses += 1
+            version = self._version
+            body = self._build()
+            etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+            # Don't keep a body that a concurrent write already made stale
+            with self._state_lock:
+                if version == self._version:
+                    self._entry = (body, etag, time.monotonic())
+            return body, etag
+
+    def invalidate(self):
+        """Drop the cached body; the next get() rebuilds it."""
+        with self._state_lock:
+            self._version += 1
+            self._entry = None
+
+    def stats(self):
+        """Return cache counters."""
+        return {
+            'version': self._version,
+            'cached': self._entry is not None,
+            'hits': self._hits,
+            'misses': self._misses,
+        }
+
+    def _expired(self, entry):
+        return self.max_age is not None and time.monotonic() - entry[2] > self.max_age
@@ -0,0 +1,179 @@
+"""
+Restaurant Management System - Embedded SQLite Backend
+A driver module with the same surface the app uses from mariadb/mysql.connector
+(connect(**DB_CONFIG), Error, cursor(dictionary=True), %s placeholders), backed
+by an SQLite file in WAL mode.
+
+The MySQL dialect the app speaks is translated statement by statement:
+placeholders, AUTO_INCREMENT/ENUM column definitions, CURRENT_TIMESTAMP,
+INSERT IGNORE, ON DUPLICATE KEY UPDATE, SELECT ... FOR UPDATE, CREATE
+DATABASE/USE and the information_schema table and index lookups used by the
+migrations.
+"""
+
+import os
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+
+Error = sqlite3.Error
+
+# Store Decimal/datetime the way MariaDB would hand them back
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter('DECIMAL', lambda raw: Decimal(raw.decode()))
+sqlite3.register_converter('TIMESTAMP', lambda raw: datetime.fromisoformat(raw.decode()))
+sqlite3.register_converter('DATETIME', lambda raw: datetime.fromisoformat(raw.decode()))
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+)
+BUSY_TIMEOUT = 5.0  # seconds to wait for another writer
+
+_TRANSLATIONS = [
+    (re.compile(r'\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b', re.I), 'INTEGER PRIMARY KEY AUTOINCREMENT'),
+    (re.compile(r'\b(\w+)\s+ENUM\s*\(([^)]*)\)', re.I), r'\1 TEXT CHECK (\1 IN (\2))'),
+    # MariaDB's CURRENT_TIMESTAMP is session-local time, like the datetime.now()
+    # values the app writes; SQLite's is UTC
+    (re.compile(r'\bDEFAULT\s+CURRENT_TIMESTAMP\b', re.I), "DEFAULT (datetime('now', 'localtime'))"),
+    (re.compile(r'\bCURRENT_TIMESTAMP\b', re.I), "datetime('now', 'localtime')"),
+    (re.compile(r'\bINSERT\s+IGNORE\b', re.I), 'INSERT OR IGNORE'),
+    (re.compile(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b', re.I), 'ON CONFLICT DO UPDATE SET'),
+    (re.compile(r'\bVALUES\((\w+)\)', re.I), r'excluded.\1'),
+    (re.compile(r'\s+FOR\s+UPDATE\b', re.I), ''),
+]
+_CREATE_DATABASE = re.compile(r'^\s*CREATE\s+DATABASE\b', re.I)
+_USE = re.compile(r'^\s*USE\s+`?(\w+)`?\s*$', re.I)
+# Statements that may open a transaction which later writes
+_WRITE_INTENT = re.compile(r'\bFOR\s+UPDATE\b|^\s*SAVEPOINT\b', re.I)
+_INDEX_LOOKUP = "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND name = ?"
+_TABLE_LOOKUP = "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?"
+
+
+def database_path(name):
+    """Map a DB_CONFIG database name to a file path (names without a suffix get .sqlite3)."""
+    if name == ':memory:' or os.path.splitext(name)[1]:
+        return name
+    return f"{name}.sqlite3"
+
+
+def translate(sql):
+    """Translate one MySQL-dialect statement to SQLite."""
+    if 'information_schema.statistics' in sql:
+        return _INDEX_LOOKUP
+    if 'information_schema.tables' in sql:
+        return _TABLE_LOOKUP
+    sql = sql.replace('%s', '?')
+    for pattern, replacement in _TRANSLATIONS:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+def connect(database=None, **_server_options):
+    """Open a connection; host/user/password/port are accepted and ignored."""
+    return Connection(database)
+
+
+class Connection:
+    """DB-API connection wrapper with MySQL-style cursors."""
+
+    def __init__(self, database=None):
+        self._raw = None
+        self.database = None
+        self._open(database)
+
+    def cursor(self, dictionary=False, buffered=None, **_options):
+        # SQLite cursors already step through results lazily, so buffered is ignored
+        return Cursor(self, dictionary)
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def close(self):
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+
+    def ping(self):
+        self._raw.execute("SELECT 1")
+
+    @property
+    def in_transaction(self):
+        return self._raw.in_transaction
+
+    def _open(self, database):
+        """(Re)open the file behind a database name; without one, use a scratch in-memory database."""
+        self.close()
+        path = database_path(database) if database else ':memory:'
+        raw = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                              detect_types=sqlite3.PARSE_DECLTYPES, isolation_level='IMMEDIATE')
+        for pragma in PRAGMAS:
+            raw.execute(pragma)
+        self._raw = raw
+        self.database = database
+
+
+class Cursor:
+    """Cursor wrapper that translates statements and optionally returns dict rows."""
+
+    def __init__(self, connection, dictionary=False):
+        self._connection = connection
+        self._cursor = connection._raw.cursor()
+        if dictionary:
+            self._cursor.row_factory = _dict_row
+
+    def execute(self, sql, params=()):
+        if _CREATE_DATABASE.match(sql):
+            return  # the database file is created on first connect
+        use = _USE.match(sql)
+        if use:
+            # Switching databases means switching files
+            self._connection._open(use.group(1))
+            self._cursor = self._connection._raw.cursor()
+            return
+        if _WRITE_INTENT.search(sql) and not self._connection.in_transaction:
+            # Take the write lock up front: a deferred transaction that read first can't
+            # upgrade once another writer has committed (SQLITE_BUSY, without waiting)
+            self._cursor.execute("BEGIN IMMEDIATE")
+        self._cursor.execute(translate(sql), tuple(params or ()))
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(translate(sql), [tuple(params) for params in seq_of_params])
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size=1):
+        return self._cursor.fetchmany(size)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def close(self):
+        self._cursor.close()
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
@@ -0,0 +1,121 @@
+"""
+Restaurant Management System - Static Asset Cache
+Loads pages and assets into memory once, precompresses them (gzip, and
+brotli when installed) and serves them with content-hash ETags.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+MIN_COMPRESS_SIZE = 512  # bytes; smaller bodies aren't worth the header overhead
+
+
+class Asset:
+    """One file held in memory with its precomputed encodings."""
+
+    def __init__(self, path, body, mtime):
+        self.path = path
+        self.mtime = mtime
+        self.mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.etag = hashlib.blake2b(body, digest_size=12).hexdigest()
+        self.encodings = {'identity': body}
+        if self.mimetype.startswith(COMPRESSIBLE_TYPES) and len(body) >= MIN_COMPRESS_SIZE:
+            self.encodings['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.encodings['br'] = brotli.compress(body)
+
+    def select(self, accept_encoding):
+        """Pick the smallest encoding the client accepts; return (encoding, body)."""
+        best = 'identity'
+        for encoding in ('br', 'gzip'):
+            if encoding in self.encodings and accept_encoding[encoding]:
+                if len(self.encodings[encoding]) < len(self.encodings[best]):
+                    best = encoding
+        return best, self.encodings[best]
+
+
+class StaticAssets:
+    """In-memory store of whitelisted files under a root directory."""
+
+    def __init__(self, root, extensions, directories=('',), aliases=None, reload=False):
+        self.root = root
+        self.extensions = {ext.lower() for ext in extensions}
+        self.directories = directories
+        self.aliases = dict(aliases or {})  # public name -> path relative to root
+        self.reload = reload
+        self._lock = threading.Lock()
+        self._assets = {}
+
+    def load(self):
+        """(Re)load every whitelisted file into memory."""
+        assets = {}
+        for relative in self._discover():
+            asset = self._read(relative)
+            if asset is not None:
+                assets[relative] = asset
+        with self._lock:
+            self._assets = assets
+        return len(assets)
+
+    def get(self, name):
+        """Return the Asset for a public name, or None if it isn't served."""
+        relative = self.aliases.get(name, name)
+        asset = self._assets.get(relative)
+        if asset is None or not self.reload:
+            return asset
+
+        # Development: pick up edits without a restart
+        try:
+            mtime = os.stat(os.path.join(self.root, relative)).st_mtime
+        except OSError:
+            with self._lock:
+                self._assets.pop(relative, None)
+            return None
+        if mtime != asset.mtime:
+            asset = self._read(relative)
+            with self._lock:
+                self._assets[relative] = asset
+        return asset
+
+    def stats(self):
+        with self._lock:
+            assets = list(self._assets.values())
+        return {
+            'files': len(assets),
+            'bytes': sum(len(a.encodings['identity']) for a in assets),
+            'compressed_bytes': sum(len(body) for a in assets for body in a.encodings.values()),
+        }
+
+    # Internal helpers
+    def _discover(self):
+        found = set(self.aliases.values())
+        for directory in self.directories:
+            base = os.path.join(self.root, directory)
+            if not os.path.isdir(base):
+                continue
+            for dirpath, dirnames, filenames in os.walk(base):
+                if directory == '':
+                    dirnames[:] = []  # the project root itself is not walked recursively
+                for filename in filenames:
+                    if filename.rsplit('.', 1)[-1].lower() in self.extensions:
+                        found.add(os.path.relpath(os.path.join(dirpath, filename), self.root).replace(os.sep, '/'))
+        return sorted(found)
+
+    def _read(self, relative):
+        path = os.path.join(self.root, relative)
+        try:
+            mtime = os.stat(path).st_mtime
+            with open(path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        return Asset(relative, body, mtime)
@@ -1,10 +1,18 @@
 """
 Test script for Restaurant Management System API
 Run this after starting the Flask server to verify all endpoints work correctly.
+
+Load testing mode:
+    python test_api.py load --concurrency 200 --duration 60 --output run.json
 """
 
 import requests
 import json
+import argparse
+import random
+import threading
+import time
+from collections import defaultdict
 
 BASE_URL = "http://localhost:5000/api"
 
@@ -104,6 +112,16 @@ def test_dashboard_stats():
         print(f"❌ Error: {e}")
         return False
 
+def build_order_data(items, customer_name="Test Customer",
+                     customer_email="test@example.com", customer_phone="+1234567890"):
+    """Build a POST /api/orders payload."""
+    return {
+        "customer_name": customer_name,
+        "customer_email": customer_email,
+        "customer_phone": customer_phone,
+        "items": items
+    }
+
 def test_create_order():
     """Test creating a new order."""
     print_section("Testing POST /api/orders")
@@ -117,17 +135,7 @@ def test_create_order():
             return False
         
         # Create order data
-        order_data = {
-            "customer_name": "Test Customer",
-            "customer_email": "test@example.com",
-            "customer_phone": "+1234567890",
-            "items": [
-                {
-                    "product_id": products[0]['id'],
-                    "quantity": 2
-                }
-            ]
-        }
+        order_data = build_order_data([{"product_id": products[0]['id'], "quantity": 2}])
         
         response = requests.post(
             f"{BASE_URL}/orders",
@@ -184,11 +192,203 @@ def run_all_tests():
     
     return passed == total
 
+# Load Testing
+# Each scenario makes one or more requests through timed() and returns nothing.
+# Scenarios draw every random choice from the worker's rng, so a --seed run
+# picks the same scenarios, orders and status bumps each time.
+DEFAULT_MIX = {
+    "browse_products": 45,
+    "view_menus": 20,
+    "place_order": 20,
+    "bump_status": 10,
+    "view_dashboard": 5,
+}
+STATUS_FLOW = {"pending": "preparing", "preparing": "completed"}
+
+class LoadRecorder:
+    """Thread-safe collection of per-endpoint latencies and errors."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.open_orders = []  # [order_id, status] created during the run
+
+    def record(self, endpoint, seconds, ok):
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            if not ok:
+                self.errors[endpoint] += 1
+
+def timed(session, recorder, method, endpoint, path, **kwargs):
+    """Send one request and record its latency under the endpoint label."""
+    start = time.perf_counter()
+    try:
+        response = session.request(method, f"{BASE_URL}{path}", timeout=30, **kwargs)
+        ok = response.status_code < 400
+    except requests.RequestException:
+        response, ok = None, False
+    recorder.record(endpoint, time.perf_counter() - start, ok)
+    return response
+
+def scenario_browse_products(session, recorder, products, rng):
+    timed(session, recorder, "GET", "GET /products", "/products")
+
+def scenario_view_menus(session, recorder, products, rng):
+    timed(session, recorder, "GET", "GET /menus", "/menus")
+
+def scenario_view_dashboard(session, recorder, products, rng):
+    timed(session, recorder, "GET", "GET /dashboard/stats", "/dashboard/stats")
+
+def scenario_place_order(session, recorder, products, rng):
+    diner = rng.randint(1, 5000)
+    items = [{"product_id": product["id"], "quantity": rng.randint(1, 3)}
+             for product in rng.sample(products, min(len(products), rng.randint(1, 4)))]
+    order_data = build_order_data(items, customer_name=f"Load Diner {diner}",
+                                  customer_email=f"diner{diner}@load.test",
+                                  customer_phone=f"+1555{diner:07d}")
+    response = timed(session, recorder, "POST", "POST /orders", "/orders", json=order_data)
+    if response is not None and response.status_code == 201:
+        with recorder.lock:
+            recorder.open_orders.append([response.json()["order_id"], "pending"])
+
+def scenario_bump_status(session, recorder, products, rng):
+    # Advance an order placed during this run, like a kitchen screen would
+    with recorder.lock:
+        if not recorder.open_orders:
+            order = None
+        else:
+            order = recorder.open_orders.pop(rng.randrange(len(recorder.open_orders)))
+    if order is None:
+        timed(session, recorder, "GET", "GET /orders", "/orders?status=pending&limit=20")
+        return
+    order_id, status = order
+    next_status = STATUS_FLOW[status]
+    timed(session, recorder, "PUT", "PUT /orders/<id>", f"/orders/{order_id}", json={"status": next_status})
+    if next_status in STATUS_FLOW:
+        with recorder.lock:
+            recorder.open_orders.append([order_id, next_status])
+
+SCENARIOS = {
+    "browse_products": scenario_browse_products,
+    "view_menus": scenario_view_menus,
+    "place_order": scenario_place_order,
+    "bump_status": scenario_bump_status,
+    "view_dashboard": scenario_view_dashboard,
+}
+
+def parse_mix(value):
+    """Parse 'browse_products=50,place_order=20' into a weight dict."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def summarize(recorder, elapsed, settings, started_at):
+    """Build the JSON report: throughput and latency percentiles per endpoint."""
+    endpoints = {}
+    total = 0
+    total_errors = 0
+    for endpoint, samples in sorted(recorder.latencies.items()):
+        samples = sorted(samples)
+        total += len(samples)
+        total_errors += recorder.errors[endpoint]
+        endpoints[endpoint] = {
+            "requests": len(samples),
+            "errors": recorder.errors[endpoint],
+            "throughput_rps": round(len(samples) / elapsed, 2),
+            "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+            "max_ms": round(samples[-1] * 1000, 2),
+        }
+    return {
+        "base_url": BASE_URL,
+        "settings": settings,
+        "started_at": started_at,
+        "duration_s": round(elapsed, 2),
+        "requests": total,
+        "errors": total_errors,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+def run_load_test(concurrency=50, duration=30.0, mix=None, seed=None):
+    """Run the scenario mix on a thread pool for `duration` seconds and return the report."""
+    mix = mix or DEFAULT_MIX
+    products = requests.get(f"{BASE_URL}/products", timeout=30).json()
+    if not products:
+        raise RuntimeError("No products available; seed the database first")
+
+    recorder = LoadRecorder()
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    settings = {"concurrency": concurrency, "duration_s": duration, "mix": mix, "seed": seed}
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def worker(worker_id):
+        rng_seed = None if seed is None else seed + worker_id
+        local_random = random.Random(rng_seed)
+        session = requests.Session()  # keep-alive, like a real browser tab
+        while time.perf_counter() < deadline:
+            scenario = local_random.choices(names, weights)[0]
+            SCENARIOS[scenario](session, recorder, products, local_random)
+        session.close()
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(recorder, time.perf_counter() - start, settings, started_at)
+
+def main():
+    """Run the functional tests (default) or a load test."""
+    global BASE_URL
+    parser = argparse.ArgumentParser(description="Restaurant Management System API tests")
+    parser.add_argument("mode", nargs="?", choices=["test", "load"], default="test",
+                        help="'test' runs the functional checks, 'load' generates concurrent traffic")
+    parser.add_argument("--base-url", default=BASE_URL, help="API base URL (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent workers (load mode)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run (load mode)")
+    parser.add_argument("--mix", type=parse_mix, default=None,
+                        help="scenario weights, e.g. browse_products=50,place_order=20 "
+                             f"(scenarios: {', '.join(SCENARIOS)})")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for a repeatable mix")
+    parser.add_argument("--output", help="write the load report JSON to this file")
+    args = parser.parse_args()
+    BASE_URL = args.base_url.rstrip("/")
+
+    if args.mode == "test":
+        return run_all_tests()
+
+    print_section(f"Load test: {args.concurrency} workers for {args.duration:g}s")
+    report = run_load_test(args.concurrency, args.duration, args.mix, args.seed)
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report_json)
+        print(f"📄 Report written to {args.output}")
+    print(report_json)
+    return report["errors"] == 0
+
 if __name__ == "__main__":
     try:
-        run_all_tests()
+        main()
     except KeyboardInterrupt:
         print("\n\n⚠️  Tests interrupted by user")
     except Exception as e:
         print(f"\n\n❌ Test suite failed: {e}")
-
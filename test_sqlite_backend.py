@@ -0,0 +1,281 @@
+"""
+API tests on the embedded SQLite backend (no MariaDB server needed).
+
+Runs the Flask app through its test client against a scratch SQLite file:
+    python -m pytest test_sqlite_backend.py
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+os.environ['DB_BACKEND'] = 'sqlite'
+
+import pytest
+
+import app
+import migrations
+import sqlite_backend
+from db_pool import ConnectionPool, PoolTimeout
+from group_commit import GroupCommitWriter, WriterTimeout
+from image_pipeline import ImagePipeline
+from order_events import EventBroker, EventRelay
+
+if app.DB_BACKEND != 'sqlite':
+    pytest.skip('app was already imported with another DB_BACKEND', allow_module_level=True)
+
+NDJSON = {'Accept': 'application/x-ndjson'}
+
+
+@pytest.fixture(scope='module')
+def client(tmp_path_factory):
+    """A test client on a freshly initialized database in a temporary directory."""
+    directory = tmp_path_factory.mktemp('sqlite')
+    previous_dir, previous_database = os.getcwd(), app.DB_CONFIG['database']
+    os.chdir(directory)
+    app.DB_CONFIG['database'] = 'restaurant_test'
+    app.db_pool.close()
+    try:
+        assert app.initialize_database()
+        yield app.app.test_client()
+    finally:
+        app.order_writer.shutdown()
+        app.db_pool.close()
+        app.DB_CONFIG['database'] = previous_database
+        os.chdir(previous_dir)
+
+
+def place_order(client, name, items, email=None, phone=None):
+    response = client.post('/api/orders', json={
+        'customer_name': name,
+        'customer_email': email or f"{name.lower()}@example.com",
+        'customer_phone': phone or f"+1{abs(hash(name)) % 10 ** 9:09d}",
+        'items': [{'product_id': product_id, 'quantity': quantity} for product_id, quantity in items],
+    })
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['order_id']
+
+
+def stats_check(client):
+    """Run 'flask stats check'; return (exit code, output)."""
+    result = app.app.test_cli_runner().invoke(args=['stats', 'check'])
+    return result.exit_code, result.output
+
+
+def test_column_defaults_use_local_time_like_the_app(client, monkeypatch):
+    monkeypatch.setenv('TZ', 'Asia/Kolkata')  # UTC+5:30, so UTC defaults would stand out
+    time.tzset()
+    try:
+        with app.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO customers (name, email) VALUES (%s, %s)", ('Clock', 'clock@example.com'))
+            cursor.execute("SELECT created_at FROM customers WHERE id = %s", (cursor.lastrowid,))
+            created_at = cursor.fetchone()[0]
+            conn.rollback()
+        assert abs(created_at - datetime.now()) < timedelta(minutes=1)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_pool_times_out_when_every_connection_is_checked_out(tmp_path):
+    pool = ConnectionPool(lambda: sqlite_backend.connect(str(tmp_path / 'pool.sqlite3')), size=1, timeout=0.05)
+    with pool.connection():
+        with pytest.raises(PoolTimeout):
+            pool.acquire()
+    with pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1")
+        assert cursor.fetchone()[0] == 1
+    assert pool.stats()['timeouts'] == 1
+    pool.close()
+
+
+def test_orders_page_with_a_cursor_without_repeats(client):
+    for index in range(7):
+        place_order(client, f'Pager{index}', [(3, 1)])
+
+    first = client.get('/api/orders?limit=4')
+    second = client.get(f"/api/orders?limit=4&cursor={first.headers['X-Next-Cursor']}")
+    orders = first.get_json() + second.get_json()
+    assert len({order['id'] for order in orders}) == len(orders) == 8
+    assert all(order['items'] for order in orders if order['customer_name'].startswith('Pager'))
+
+    searched = client.get('/api/orders?q=Pager3').get_json()
+    assert [order['customer_name'] for order in searched] == ['Pager3']
+
+
+def test_streamed_order_export_matches_the_buffered_list(client):
+    place_order(client, 'Streamer', [(2, 1)])
+    streamed = client.get('/api/orders', headers=NDJSON).get_data(as_text=True).splitlines()
+    buffered = client.get(f'/api/orders?limit={app.ORDERS_MAX_PAGE_SIZE}').get_json()
+    assert [json.loads(line) for line in streamed] == buffered
+
+    small = client.get('/api/orders?limit=2', headers=NDJSON).get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in small] == buffered[:2]
+
+
+def test_concurrent_order_exports_share_a_small_pool(client):
+    size = app.db_pool.size
+    app.db_pool.size = 2
+    try:
+        streams = [client.get('/api/orders', headers=NDJSON, buffered=False) for _ in range(2)]
+        bodies = [b''.join(stream.response) for stream in streams]
+        assert bodies[0] == bodies[1] and bodies[0]
+    finally:
+        app.db_pool.size = size
+
+
+def test_create_and_cancel_order_keep_counters_in_step(client):
+    before = client.get('/api/dashboard/stats').get_json()
+    order_id = place_order(client, 'Alice', [(1, 2), (2, 1)])
+
+    stats = client.get('/api/dashboard/stats').get_json()
+    assert stats['total_orders'] == before['total_orders'] + 1
+    assert stats['pending_orders'] == before['pending_orders'] + 1
+
+    assert client.put(f'/api/orders/{order_id}', json={'status': 'cancelled'}).status_code == 200
+    stats = client.get('/api/dashboard/stats?check_top_products=1').get_json()
+    assert stats['pending_orders'] == before['pending_orders']
+    assert stats['top_products_check']['matches']
+    assert stats_check(client)[0] == 0
+
+
+def test_stats_check_reports_drift_until_rebuilt(client):
+    with app.get_db_connection() as conn:
+        conn.cursor().execute("UPDATE dashboard_counters SET value = value + 5 WHERE name = 'total_orders'")
+        conn.commit()
+    exit_code, output = stats_check(client)
+    assert exit_code == 1 and 'total_orders' in output
+
+    assert app.app.test_cli_runner().invoke(args=['stats', 'rebuild']).exit_code == 0
+    assert stats_check(client)[0] == 0
+
+
+def test_metrics_report_running_totals_as_counters(client):
+    client.get('/api/products')
+    text = client.get('/metrics').get_data(as_text=True)
+    assert '# TYPE restaurant_catalog_cache_misses_total counter' in text
+    assert '# TYPE restaurant_db_pool_timeouts_total counter' in text
+    assert '# TYPE restaurant_db_pool_in_use gauge' in text
+    assert '# TYPE restaurant_catalog_cache_hits gauge' not in text
+
+
+def test_group_commit_writer_commits_concurrent_orders(client, monkeypatch):
+    monkeypatch.setattr(app, 'ORDER_GROUP_COMMIT', True)
+    items = app.order_writer.stats()['items']
+    order_ids = []
+
+    def submit(index):
+        # Each thread gets its own client, as concurrent requests would
+        order_ids.append(place_order(app.app.test_client(), f'Batch{index}', [(1, 1), (4, 2)],
+                                     phone=f'+1555000{index:04d}'))
+
+    threads = [threading.Thread(target=submit, args=(index,)) for index in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(order_ids)) == 20
+    assert app.order_writer.stats()['items'] == items + 20
+    assert app.order_writer.stats()['failed'] == 0
+    assert stats_check(client)[0] == 0
+
+
+def test_group_commit_writer_withdraws_items_left_in_the_queue(client):
+    started, release = threading.Event(), threading.Event()
+    applied = []
+
+    def apply(cursor, item):
+        started.set()
+        release.wait()
+        applied.append(item)
+        return item
+
+    writer = GroupCommitWriter(app.get_db_connection, apply, max_batch=1, max_wait=0, timeout=0.05)
+    first = threading.Thread(target=writer.submit, args=('first',))
+    first.start()
+    started.wait()
+    with pytest.raises(WriterTimeout):
+        writer.submit('second')  # queued behind the running batch
+    release.set()
+    first.join()
+    writer.shutdown()
+    assert applied == ['first']
+
+
+def test_archived_orders_are_listed_and_keep_their_products(client):
+    created = client.post('/api/products', data={'name': 'Archived Special', 'category': 'Test', 'price': '4.50'})
+    product_id = created.get_json()['id']
+    order_id = place_order(client, 'Bob', [(product_id, 3)])
+    assert client.put(f'/api/orders/{order_id}', json={'status': 'completed'}).status_code == 200
+
+    with app.get_db_connection() as conn:
+        assert app.archive_orders(conn, older_than_days=-1) >= 1
+
+    hot = [order['id'] for order in client.get('/api/orders').get_json()]
+    archived = [order['id'] for order in client.get('/api/orders?include_archived=1').get_json()]
+    assert order_id not in hot and order_id in archived
+
+    assert client.delete(f'/api/products/{product_id}').status_code == 409
+    archived_order = next(order for order in client.get('/api/orders?include_archived=1').get_json()
+                          if order['id'] == order_id)
+    assert [item['product_id'] for item in archived_order['items']] == [product_id]
+    stats = client.get('/api/dashboard/stats?check_top_products=1').get_json()
+    assert stats['top_products_check']['matches']
+    assert stats_check(client)[0] == 0
+
+
+def test_unordered_products_can_be_deleted(client):
+    created = client.post('/api/products', data={'name': 'Never Ordered', 'category': 'Test', 'price': '1.00'})
+    product_id = created.get_json()['id']
+    assert client.delete(f'/api/products/{product_id}').status_code == 200
+    assert client.delete(f'/api/products/{product_id}').status_code == 404
+    assert stats_check(client)[0] == 0
+
+
+def test_added_tables_come_from_migrations(client):
+    result = app.app.test_cli_runner().invoke(args=['db', 'status'])
+    assert 'Add the order archive tables' in result.output and 'pending' not in result.output
+    assert 'Add the dashboard counters table' in result.output
+    assert 'Add the hourly sales rollup tables' in result.output
+
+    with app.get_db_connection() as conn:
+        cursor = conn.cursor()
+        for table in ('orders_archive', 'order_items_archive', 'product_sales', 'dashboard_counters',
+                      'sales_hourly', 'product_sales_hourly'):
+            assert migrations.table_exists(cursor, table)
+        assert not migrations.CreateTable('orders_archive', 'id INT PRIMARY KEY').apply(cursor)
+
+
+def test_image_pipeline_remembers_a_bounded_number_of_empty_scans(tmp_path):
+    pipeline = ImagePipeline(str(tmp_path), '/static/uploads', workers=1, scan_capacity=3)
+    for index in range(50):
+        assert pipeline.best_variant(f'missing{index}.png') == f'missing{index}.png'
+    assert not pipeline._scanned_at
+
+    for index in range(5):
+        (tmp_path / f'upload{index}.png').write_bytes(b'not really a png')
+        assert pipeline.best_variant(f'upload{index}.png') == f'upload{index}.png'
+    assert list(pipeline._scanned_at) == ['upload2', 'upload3', 'upload4']
+    pipeline.shutdown()
+
+
+def test_order_events_are_relayed_from_the_shared_log(client):
+    app.order_relay.start()
+    order_id = place_order(client, 'Streamed', [(1, 1)])
+    assert client.put(f'/api/orders/{order_id}', json={'status': 'preparing'}).status_code == 200
+    app.order_relay.sync()
+
+    events = [(event_type, json.loads(data)) for _, event_type, data in app.order_events.events_after(0)[0]]
+    assert ('order_status_changed', {'order_id': order_id, 'status': 'preparing',
+                                     'previous_status': 'pending'}) in events
+    assert any(event_type == 'order_created' and data['order_id'] == order_id for event_type, data in events)
+
+    # Another worker process reads the same log and numbers the events the same way
+    other = EventBroker()
+    EventRelay(other, app.read_order_events).sync()
+    assert other.events_after(0)[0][-2:] == app.order_events.events_after(0)[0][-2:]
@@ -0,0 +1,120 @@
+"""
+Restaurant Management System - Top Sellers Tracker
+Running per-product units sold and revenue, all-time and in per-minute
+buckets for sliding windows (last hour, today), so the dashboard can rank
+products without aggregating order_items.
+
+Each process updates its tracker from its own committed writes. The tracker
+reloads from the database once it is older than max_age, which also brings in
+orders placed through other worker processes.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+
+def _minute(moment):
+    return moment.replace(second=0, microsecond=0)
+
+
+def _money(value):
+    return Decimal(str(value or 0)).quantize(Decimal('0.01'))
+
+
+class TopSellers:
+    """In-memory per-product sales totals with minute buckets for recent windows."""
+
+    def __init__(self, retention=timedelta(days=1), max_age=60.0):
+        self.retention = retention  # how far back sliding windows can reach
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._totals = {}   # product_id -> [units, revenue]
+        self._buckets = {}  # minute -> {product_id: [units, revenue]}
+        self._loaded_at = None
+        self._updates = 0
+        self._loads = 0
+
+    def needs_load(self):
+        """Whether the tracker has never been loaded or is older than max_age."""
+        loaded_at = self._loaded_at
+        return loaded_at is None or (self.max_age is not None and time.monotonic() - loaded_at > self.max_age)
+
+    def load(self, totals, recent_lines, now):
+        """Replace all state: totals are (product_id, units, revenue) rows and
+        recent_lines (order_date, product_id, units, revenue) rows within the retention period."""
+        new_totals = {product_id: [int(units), _money(revenue)] for product_id, units, revenue in totals}
+        new_buckets = {}
+        cutoff = now - self.retention
+        for order_date, product_id, units, revenue in recent_lines:
+            if order_date >= cutoff:
+                self._add(new_buckets.setdefault(_minute(order_date), {}), product_id, int(units), _money(revenue))
+        with self._lock:
+            self._totals = new_totals
+            self._buckets = new_buckets
+            self._loaded_at = time.monotonic()
+            self._loads += 1
+
+    def record(self, order_date, lines, sign=1):
+        """Add an order's (product_id, units, revenue) lines; sign=-1 removes them (cancellation)."""
+        with self._lock:
+            if self._loaded_at is None:
+                return  # the first load will read it from the database
+            now = datetime.now()
+            self._prune(now)
+            buckets = [self._totals]
+            if order_date >= now - self.retention:
+                buckets.append(self._buckets.setdefault(_minute(order_date), {}))
+            for totals in buckets:
+                for product_id, units, revenue in lines:
+                    self._add(totals, product_id, sign * int(units), sign * _money(revenue))
+            self._updates += 1
+
+    def top(self, limit=5, since=None):
+        """Return up to limit (product_id, units, revenue) tuples, best sellers first.
+
+        With since, only orders placed at or after that time count.
+        """
+        with self._lock:
+            if since is None:
+                totals = {product_id: tuple(values) for product_id, values in self._totals.items()}
+            else:
+                self._prune(datetime.now())
+                totals = {}
+                start = _minute(since)
+                for minute, bucket in self._buckets.items():
+                    if minute >= start:
+                        for product_id, (units, revenue) in bucket.items():
+                            self._add(totals, product_id, units, revenue)
+        ranked = sorted(
+            ((product_id, int(units), revenue) for product_id, (units, revenue) in totals.items() if units > 0),
+            key=lambda row: (-row[1], -row[2], row[0])
+        )
+        return ranked[:limit]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'loaded': self._loaded_at is not None,
+                'age_seconds': round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+                'products': len(self._totals),
+                'buckets': len(self._buckets),
+                'updates': self._updates,
+                'loads': self._loads,
+            }
+
+    # Internal helpers (callers hold self._lock)
+    def _prune(self, now):
+        cutoff = now - self.retention
+        for minute in [minute for minute in self._buckets if minute < cutoff]:
+            del self._buckets[minute]
+
+    @staticmethod
+    def _add(totals, product_id, units, revenue):
+        entry = totals.get(product_id)
+        if entry is None:
+            totals[product_id] = [units, revenue]
+        else:
+            entry[0] += units
+            entry[1] += revenue